@@ -4,6 +4,9 @@ from typing import TypedDict, Optional, List, Dict, Any
 class AgentState(TypedDict, total=False):
     """
     Global state shared across graph nodes.
+
+    Stage results travel here in memory; the JSONL logs in data/ are an
+    asynchronous audit trail (see audit_sink.py), not the data path.
     """
 
     # -------- user inputs --------
@@ -15,10 +18,13 @@ class AgentState(TypedDict, total=False):
     schema_result: Optional[Dict[str, Any]]
     data_understanding_result: Optional[Dict[str, Any]]
 
+    # full column inspection record (profiles, drop recommendations, checksum)
+    column_inspection: Optional[Dict[str, Any]]
+
     # -------- preprocess 1 --------
     preprocess_last_n: Optional[int]
     preprocess_1_result: Optional[List[Dict[str, Any]]]
 
     # -------- model selector --------
     model_selector_last_n: Optional[int]
-    model_selection_result: Optional[List[Dict[str, Any]]]
\ No newline at end of file
+    model_selection_result: Optional[List[Dict[str, Any]]]
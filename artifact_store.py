@@ -0,0 +1,296 @@
+import json
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from audit_sink import submit, flush
+from fingerprint import file_fingerprint
+
+# --------------------------------------------------
+# Indexed artifact store
+# --------------------------------------------------
+# Stage results keyed by (kind, dataset content hash) and run id.
+# Latest-record lookups go through an index instead of scanning
+# the ever-growing JSONL logs in data/.
+PROJECT_ROOT = Path(__file__).resolve().parents[0]
+STORE_PATH = PROJECT_ROOT / "data" / "artifacts.sqlite"
+
+# kind -> legacy JSONL history (for migration)
+JSONL_HISTORY = {
+    "schema": PROJECT_ROOT / "data" / "data_classification.jsonl",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id        TEXT NOT NULL UNIQUE,
+    kind          TEXT NOT NULL,
+    dataset_hash  TEXT,
+    dataset_path  TEXT,
+    created_at    TEXT NOT NULL,
+    payload       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_artifacts_hash ON artifacts (kind, dataset_hash, id);
+CREATE INDEX IF NOT EXISTS ix_artifacts_path ON artifacts (kind, dataset_path, id);
+"""
+
+
+def _connect(store_path=STORE_PATH):
+    store_path = Path(store_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(store_path, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _normalize_path(path):
+    return str(Path(path).resolve()) if path else None
+
+
+def dataset_content_hash(path):
+    """
+    SHA-256 of the dataset file content, None if the file is missing.
+    Cached per file version (see fingerprint.py).
+    """
+
+    return file_fingerprint(path)
+
+
+# --------------------------------------------------
+# WRITE
+# --------------------------------------------------
+def _insert(run_id, kind, payload_json, dataset_path, dataset_hash, created_at, store_path):
+
+    if dataset_hash is None and dataset_path:
+        dataset_hash = dataset_content_hash(dataset_path)
+
+    with _connect(store_path) as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO artifacts "
+            "(run_id, kind, dataset_hash, dataset_path, created_at, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                run_id,
+                kind,
+                dataset_hash,
+                _normalize_path(dataset_path),
+                created_at,
+                payload_json,
+            ),
+        )
+    conn.close()
+
+
+def put_artifact(kind, payload, dataset_path=None, dataset_hash=None,
+                 run_id=None, store_path=STORE_PATH):
+    """
+    Store one stage result. Returns its run id.
+    The insert (and dataset hashing) runs on the audit sink thread.
+    """
+
+    run_id = run_id or uuid.uuid4().hex
+
+    payload_json = json.dumps(payload, ensure_ascii=False)
+    created_at = datetime.now(timezone.utc).isoformat()
+
+    submit(lambda: _insert(
+        run_id, kind, payload_json, dataset_path, dataset_hash, created_at, store_path
+    ))
+
+    return run_id
+
+
+# --------------------------------------------------
+# READ
+# --------------------------------------------------
+def latest_artifact(kind, dataset_hash=None, dataset_path=None, store_path=STORE_PATH):
+    """
+    Newest payload of this kind for a dataset (content hash preferred,
+    resolved path as fallback). None when nothing matches.
+    """
+
+    flush()
+
+    if not Path(store_path).exists():
+        return None
+
+    conn = _connect(store_path)
+    row = None
+
+    if dataset_hash:
+        row = conn.execute(
+            "SELECT payload FROM artifacts WHERE kind = ? AND dataset_hash = ? "
+            "ORDER BY id DESC LIMIT 1",
+            (kind, dataset_hash),
+        ).fetchone()
+
+    if row is None and dataset_path:
+        row = conn.execute(
+            "SELECT payload FROM artifacts WHERE kind = ? AND dataset_path = ? "
+            "ORDER BY id DESC LIMIT 1",
+            (kind, _normalize_path(dataset_path)),
+        ).fetchone()
+
+    conn.close()
+
+    return json.loads(row[0]) if row else None
+
+
+def get_artifact(run_id, store_path=STORE_PATH):
+
+    flush()
+
+    if not Path(store_path).exists():
+        return None
+
+    conn = _connect(store_path)
+    row = conn.execute(
+        "SELECT payload FROM artifacts WHERE run_id = ?", (run_id,)
+    ).fetchone()
+    conn.close()
+
+    return json.loads(row[0]) if row else None
+
+
+# --------------------------------------------------
+# JSONL TAIL READS (newest first, no full parse)
+# --------------------------------------------------
+TAIL_BLOCK = 1 << 16
+
+
+def iter_jsonl_reverse(path, block_size=TAIL_BLOCK):
+    """
+    Yield records of a JSONL file newest first, reading fixed-size blocks
+    backwards from the end. Only the lines actually consumed are parsed.
+    """
+
+    flush()
+
+    path = Path(path)
+    if not path.exists():
+        return
+
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+
+        # pieces of the line being assembled, last piece first
+        partial = []
+
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+
+            parts = f.read(step).split(b"\n")
+
+            if len(parts) == 1:
+                # no line break in this block: long line, keep collecting
+                partial.append(parts[0])
+                continue
+
+            # the block's last piece completes the line after it,
+            # its first piece may continue in the previous block
+            lines = [parts[-1] + b"".join(reversed(partial))] + parts[-2:0:-1]
+            partial = [parts[0]]
+
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+        line = b"".join(reversed(partial))
+        if line.strip():
+            yield json.loads(line)
+
+
+def tail_jsonl(path, n):
+    """
+    Last n records in file order.
+    """
+
+    records = []
+    if n <= 0:
+        return records
+
+    for rec in iter_jsonl_reverse(path):
+        records.append(rec)
+        if len(records) >= n:
+            break
+
+    return records[::-1]
+
+
+def latest_by_key(path, key, wanted):
+    """
+    {key value: newest record} for the wanted values; stops reading as
+    soon as every wanted value has been found.
+    """
+
+    wanted = set(wanted)
+    found = {}
+
+    if not wanted:
+        return found
+
+    for rec in iter_jsonl_reverse(path):
+        k = rec.get(key)
+        if k in wanted and k not in found:
+            found[k] = rec
+            if len(found) == len(wanted):
+                break
+
+    return found
+
+
+# --------------------------------------------------
+# MIGRATION (legacy JSONL history)
+# --------------------------------------------------
+def migrate_jsonl(kind, jsonl_path, path_key="dataset_file_path", store_path=STORE_PATH):
+    """
+    Import a JSONL log in file order so the newest line stays latest.
+    Run ids are derived from file name + line number, so re-running
+    the migration does not duplicate records.
+    """
+
+    flush()
+
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        return 0
+
+    migrated = 0
+
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f):
+            if not line.strip():
+                continue
+
+            rec = json.loads(line)
+            dataset_path = rec.get(path_key)
+
+            put_artifact(
+                kind,
+                rec,
+                dataset_path=dataset_path,
+                run_id=f"jsonl:{jsonl_path.name}:{lineno}",
+                store_path=store_path,
+            )
+            migrated += 1
+
+    return migrated
+
+
+def migrate_jsonl_history(store_path=STORE_PATH):
+    return {
+        kind: migrate_jsonl(kind, path, store_path=store_path)
+        for kind, path in JSONL_HISTORY.items()
+    }
+
+
+if __name__ == "__main__":
+    counts = migrate_jsonl_history()
+    flush()
+    for kind, n in counts.items():
+        print(f"{kind}: {n} records processed (duplicates ignored) → {STORE_PATH}")
@@ -0,0 +1,95 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from pathlib import Path
+
+# --------------------------------------------------
+# Asynchronous audit sink
+# --------------------------------------------------
+# Stages hand results to each other in memory (AgentState); the JSONL
+# logs and the artifact index are an audit trail. Their writes are
+# queued and done by one background thread in submission order.
+# Anything that reads the logs back calls flush() first.
+
+_queue = queue.Queue()
+_thread = None
+_lock = threading.Lock()
+
+
+def _worker(q):
+    while True:
+        task = q.get()
+        try:
+            task()
+        except Exception as e:
+            print(f"[AUDIT WARNING] {e}")
+        finally:
+            q.task_done()
+
+
+def _start():
+    global _thread
+
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(
+                target=_worker, args=(_queue,), name="audit-sink", daemon=True
+            )
+            _thread.start()
+
+
+def submit(task):
+    """
+    Queue a write (a callable without arguments).
+    """
+
+    _start()
+    _queue.put(task)
+
+
+def flush():
+    """
+    Block until every queued write is done.
+    """
+
+    if _thread is not None and _thread.is_alive():
+        _queue.join()
+
+
+def _append_line(path, line):
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "ab+") as f:
+        # a previous writer may have left the last line unterminated
+        f.seek(0, 2)
+        if f.tell() > 0:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+        f.write(line.encode("utf-8") + b"\n")
+
+
+def append_jsonl(path, record, **dumps_kwargs):
+    """
+    Queue one JSONL line. The record is serialized now, so later changes
+    to it by the caller do not leak into the log.
+    """
+
+    line = json.dumps(record, **dumps_kwargs)
+    submit(lambda: _append_line(Path(path), line))
+    return record
+
+
+def _after_fork():
+    # a forked child must not replay (or wait on) the parent's queue
+    global _queue, _thread, _lock
+    _queue = queue.Queue()
+    _thread = None
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(flush)
@@ -0,0 +1,185 @@
+import pandas as pd
+import numpy as np
+from itertools import combinations
+
+
+MAX_CARDINALITY = 200
+
+# columns with more distinct values than this share of their non-missing
+# rows are ID-like: on small data they "determine" every other column
+MAX_UNIQUE_RATIO = 0.5
+MAX_SAMPLE_ROWS = 100_000
+RANDOM_STATE = 42
+
+
+# --------------------------------------------------
+# CANDIDATE COLUMNS
+# --------------------------------------------------
+def categorical_candidates(df, max_cardinality=MAX_CARDINALITY,
+                           max_unique_ratio=MAX_UNIQUE_RATIO):
+    """
+    Non-numeric columns with 2..max_cardinality distinct values.
+    Higher cardinality columns are skipped to keep tables tractable,
+    near-unique (ID-like) columns because their associations are spurious.
+    """
+
+    cols = df.select_dtypes(exclude="number").columns
+    nunique = df[cols].nunique(dropna=True)
+    present = df[cols].notna().sum()
+
+    return [
+        c for c in cols
+        if 1 < nunique[c] <= max_cardinality
+        and nunique[c] <= max_unique_ratio * present[c]
+    ]
+
+
+# --------------------------------------------------
+# INTEGER CODES (factorised once)
+# --------------------------------------------------
+def sample_rows(df, max_rows=MAX_SAMPLE_ROWS, random_state=RANDOM_STATE):
+    if len(df) <= max_rows:
+        return df
+    return df.sample(n=max_rows, random_state=random_state)
+
+
+def factorize_columns(df, cols):
+    """
+    Returns (codes, n_levels).
+        codes    : int64 matrix (n_rows, n_cols)
+        n_levels : number of levels per column
+
+    Missing values become their own level so every row is counted.
+    """
+
+    codes = np.empty((len(df), len(cols)), dtype=np.int64)
+    n_levels = np.empty(len(cols), dtype=np.int64)
+
+    for j, c in enumerate(cols):
+        col_codes, uniques = pd.factorize(df[c], use_na_sentinel=True)
+        missing = col_codes < 0
+
+        if missing.any():
+            col_codes[missing] = len(uniques)
+            n_levels[j] = len(uniques) + 1
+        else:
+            n_levels[j] = len(uniques)
+
+        codes[:, j] = col_codes
+
+    return codes, n_levels
+
+
+# --------------------------------------------------
+# CONTINGENCY TABLE (bincount on combined codes)
+# --------------------------------------------------
+def contingency_table(a, b, n_a, n_b):
+    combined = a * n_b + b
+    return np.bincount(combined, minlength=n_a * n_b).reshape(n_a, n_b)
+
+
+def _entropy(counts, n):
+    p = counts[counts > 0] / n
+    return float(-(p * np.log(p)).sum())
+
+
+def cramers_v(table):
+    """
+    Bias-corrected Cramér's V (Bergsma 2013).
+    """
+
+    n = table.sum()
+    r, k = table.shape
+
+    if n == 0 or r < 2 or k < 2:
+        return 0.0
+
+    rows = table.sum(axis=1, keepdims=True)
+    cols = table.sum(axis=0, keepdims=True)
+    expected = rows * cols / n
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = np.nansum((table - expected) ** 2 / expected)
+
+    phi2 = chi2 / n
+    phi2_corr = max(0.0, phi2 - (k - 1) * (r - 1) / (n - 1))
+    r_corr = r - (r - 1) ** 2 / (n - 1)
+    k_corr = k - (k - 1) ** 2 / (n - 1)
+
+    denom = min(k_corr - 1, r_corr - 1)
+    if denom <= 0:
+        return 0.0
+
+    return float(min(1.0, np.sqrt(phi2_corr / denom)))
+
+
+def theils_u(table):
+    """
+    Returns (U(a|b), U(b|a)) for a table with a on rows, b on columns.
+    U(a|b) = fraction of the entropy of a explained by b.
+    """
+
+    n = table.sum()
+    if n == 0:
+        return 0.0, 0.0
+
+    h_a = _entropy(table.sum(axis=1), n)
+    h_b = _entropy(table.sum(axis=0), n)
+    h_ab = _entropy(table.ravel(), n)
+
+    mutual_info = h_a + h_b - h_ab
+
+    u_a_given_b = mutual_info / h_a if h_a > 0 else 1.0
+    u_b_given_a = mutual_info / h_b if h_b > 0 else 1.0
+
+    return float(u_a_given_b), float(u_b_given_a)
+
+
+# --------------------------------------------------
+# ASSOCIATION PAIRS (store column names)
+# --------------------------------------------------
+def categorical_association_pairs(
+    df,
+    min_association=0.0,
+    max_cardinality=MAX_CARDINALITY,
+    max_rows=MAX_SAMPLE_ROWS,
+    max_unique_ratio=MAX_UNIQUE_RATIO,
+):
+    """
+    Pairwise association between categorical columns.
+
+    Columns are factorised to integer codes once; each pair is
+    a single np.bincount on the combined codes.
+    Only includes pairs whose strongest measure > min_association.
+    """
+
+    cols = categorical_candidates(df, max_cardinality, max_unique_ratio)
+
+    if len(cols) < 2:
+        return []
+
+    codes, n_levels = factorize_columns(sample_rows(df, max_rows), cols)
+
+    pairs = []
+
+    for i, j in combinations(range(len(cols)), 2):
+
+        table = contingency_table(
+            codes[:, i], codes[:, j], n_levels[i], n_levels[j]
+        )
+
+        v = cramers_v(table)
+        u_ij, u_ji = theils_u(table)
+
+        if max(v, u_ij, u_ji) > min_association:
+            pairs.append({
+                "col_1": cols[i],
+                "col_2": cols[j],
+                "cramers_v": v,
+                "theils_u_1_given_2": u_ij,
+                "theils_u_2_given_1": u_ji,
+                "cardinality_1": int(n_levels[i]),
+                "cardinality_2": int(n_levels[j]),
+            })
+
+    return pairs
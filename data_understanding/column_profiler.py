@@ -196,4 +196,47 @@ def modeling_hint(semantic_type):
         return "scaling"
     if semantic_type == "text_freeform":
         return "nlp"
-    return None
\ No newline at end of file
+    return None
+
+# ----------------------------
+# column statistics (reused by preprocessing)
+# ----------------------------
+def _json_scalar(v):
+    if v is None or pd.isna(v):
+        return None
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def column_statistics(df):
+    """
+    {column: {"median", "q1", "q3", "min", "max"}} for numeric columns,
+    {column: {"mode"}} for the rest (only those are mode-imputed; a
+    consumer missing a key computes it itself). None = all missing.
+    Computed with the same pandas reductions preprocess_1 would use,
+    so the values can replace its own aggregation pass.
+    """
+
+    numeric = df.select_dtypes(include="number", exclude="bool")
+
+    stats = {}
+
+    if numeric.shape[1]:
+        median = numeric.median()
+        minimum = numeric.min()
+        maximum = numeric.max()
+        quartiles = numeric.quantile([0.25, 0.75])
+
+        for c in numeric.columns:
+            stats[c] = {
+                "median": _json_scalar(median[c]),
+                "q1": _json_scalar(quartiles.at[0.25, c]),
+                "q3": _json_scalar(quartiles.at[0.75, c]),
+                "min": _json_scalar(minimum[c]),
+                "max": _json_scalar(maximum[c]),
+            }
+
+    for c in df.columns.difference(numeric.columns, sort=False):
+        mode = df[c].mode(dropna=True)
+        stats[c] = {"mode": _json_scalar(mode.iloc[0]) if len(mode) else None}
+
+    return stats
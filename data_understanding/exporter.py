@@ -32,15 +32,19 @@ from pathlib import Path
 #     with open(out_path, "a", encoding="utf-8") as f:
 #         f.write(json.dumps(record) + "\n")
 
-import json
 from pathlib import Path
 
+from audit_sink import append_jsonl
+
 
 def export_column_inspection(dataset_path, payload):
+    """
+    Queues the inspection record for data/column_inspection.jsonl and
+    returns it.
+    """
 
     project_root = Path(__file__).resolve().parents[1]
     out_path = project_root / "data" / "column_inspection.jsonl"
-    out_path.parent.mkdir(exist_ok=True)
 
     record = {
         "dataset_file_path": str(Path(dataset_path).resolve()),
@@ -48,20 +52,5 @@ def export_column_inspection(dataset_path, payload):
         **payload
     }
 
-    # -----------------------------
-    # ensure newline separation
-    # -----------------------------
-    with open(out_path, "a+", encoding="utf-8") as f:
-
-        # move cursor to end
-        f.seek(0, 2)
-
-        # if file not empty and last char not newline → add newline
-        if f.tell() > 0:
-            f.seek(f.tell() - 1)
-            if f.read(1) != "\n":
-                f.write("\n")
-
-        # write JSON object + newline
-        f.write(json.dumps(record, ensure_ascii=False))
-        f.write("\n")
\ No newline at end of file
+    # newline repair of a truncated last line happens in the sink
+    return append_jsonl(out_path, record, ensure_ascii=False)
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from itertools import combinations
 
+from .categorical_associations import categorical_association_pairs
+
 
 # --------------------------------------------------
 # SAFE NUMERIC MATRIX
@@ -48,9 +50,12 @@ def correlation_pairs(df, min_abs_corr=0.0):
 # --------------------------------------------------
 # STRONG REDUNDANCY DETECTOR
 # --------------------------------------------------
-def redundant_features(df, threshold=0.95):
+def redundant_features(df, threshold=0.95, categorical_pairs=None):
     """
-    Features that are almost duplicates (|corr| >= threshold)
+    Features that are almost duplicates.
+        numeric     : |corr| >= threshold
+        categorical : one column (almost) determines the other,
+                      Theil's U >= threshold in either direction
     """
 
     pairs = correlation_pairs(df, min_abs_corr=threshold)
@@ -65,6 +70,26 @@ def redundant_features(df, threshold=0.95):
             "relationship": "highly_correlated"
         })
 
+    if categorical_pairs is None:
+        categorical_pairs = categorical_association_pairs(df)
+
+    for p in categorical_pairs:
+
+        u_ab = p["theils_u_1_given_2"]
+        u_ba = p["theils_u_2_given_1"]
+
+        if max(u_ab, u_ba) < threshold:
+            continue
+
+        redundant.append({
+            "feature_a": p["col_1"],
+            "feature_b": p["col_2"],
+            "correlation": p["cramers_v"],
+            "theils_u_a_given_b": u_ab,
+            "theils_u_b_given_a": u_ba,
+            "relationship": "categorical_dependency"
+        })
+
     return redundant
 
 
@@ -104,14 +129,21 @@ def derived_linear_relationships(df, threshold=0.999):
 # --------------------------------------------------
 # FEATURE DEPENDENCY GRAPH
 # --------------------------------------------------
-def feature_dependency_graph(df, threshold=0.7):
+def feature_dependency_graph(df, threshold=0.7, categorical_pairs=None):
     """
     Graph representation of feature relationships.
     Node -> connected features
+
+    Categorical pairs connect when Cramér's V >= threshold.
     """
 
     pairs = correlation_pairs(df, min_abs_corr=threshold)
 
+    if categorical_pairs is None:
+        categorical_pairs = categorical_association_pairs(df)
+
+    pairs += [p for p in categorical_pairs if p["cramers_v"] >= threshold]
+
     graph = {}
 
     for p in pairs:
@@ -127,16 +159,39 @@ def feature_dependency_graph(df, threshold=0.7):
 # --------------------------------------------------
 # AUTO FEATURE PRUNING PLANNER
 # --------------------------------------------------
-def pruning_plan(df, redundancy_threshold=0.95):
+def _categorical_drop_choice(r, df, threshold):
+    """
+    Pick the column of a categorical pair that carries no extra information.
+        one-way dependency : drop the determined column
+        two-way (bijection): drop the higher cardinality column
+    """
+
+    a = r["feature_a"]
+    b = r["feature_b"]
+
+    a_determined = r["theils_u_a_given_b"] >= threshold
+    b_determined = r["theils_u_b_given_a"] >= threshold
+
+    if a_determined and b_determined:
+        return a if df[a].nunique() > df[b].nunique() else b
+
+    return a if a_determined else b
+
+
+def pruning_plan(df, redundancy_threshold=0.95, categorical_pairs=None, target=None):
     """
     Recommend which features to drop.
     Strategy:
         drop one feature from each highly correlated pair
         prefer keeping lower missing or higher variance
+        categorical pairs: drop the column explained by the other
+        pairs with the target are skipped (see leakage.py)
     """
 
     num = numeric_nonconstant(df)
-    redundant = redundant_features(df, redundancy_threshold)
+    redundant = redundant_features(
+        df, redundancy_threshold, categorical_pairs=categorical_pairs
+    )
 
     drop = set()
 
@@ -145,7 +200,11 @@ def pruning_plan(df, redundancy_threshold=0.95):
         a = r["feature_a"]
         b = r["feature_b"]
 
-        if a in drop or b in drop:
+        if a in drop or b in drop or target in (a, b):
+            continue
+
+        if r["relationship"] == "categorical_dependency":
+            drop.add(_categorical_drop_choice(r, df, redundancy_threshold))
             continue
 
         var_a = num[a].var()
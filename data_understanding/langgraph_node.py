@@ -1,7 +1,7 @@
 from typing import Dict, Any
 
 from agent_state import AgentState
-from data_understanding.pipeline import run_data_understanding
+from data_understanding.pipeline import inspect_dataset
 
 
 def data_understanding_node(state: AgentState) -> AgentState:
@@ -10,9 +10,11 @@ def data_understanding_node(state: AgentState) -> AgentState:
 
     Input:
         state["data_path"]
+        state["schema_result"] (optional, skips the classification lookup)
 
     Output:
-        state["data_understanding_result"]
+        state["data_understanding_result"] (column profiles)
+        state["column_inspection"]         (full inspection record)
     """
 
     data_path = state.get("data_path")
@@ -20,9 +22,13 @@ def data_understanding_node(state: AgentState) -> AgentState:
     if not data_path:
         raise ValueError("data_path missing in AgentState")
 
-    result: Dict[str, Any] = run_data_understanding(data_path) #type: ignore
+    inspection: Dict[str, Any] = inspect_dataset(
+        data_path,
+        schema_result=state.get("schema_result")
+    )
 
     return {
         **state,
-        "data_understanding_result": result #type: ignore
-    }
\ No newline at end of file
+        "data_understanding_result": inspection["column_profiles"], #type: ignore
+        "column_inspection": inspection
+    }
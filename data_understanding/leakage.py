@@ -0,0 +1,184 @@
+import pandas as pd
+import numpy as np
+
+from .categorical_associations import sample_rows
+from .target_screening import (
+    MAX_LEVELS,
+    target_codes,
+    is_regression_target,
+    histogram_codes,
+    level_codes,
+    batched_correlation_ratio,
+)
+
+
+PURITY_THRESHOLD = 0.99
+AUC_THRESHOLD = 0.99
+RANK_CORR_THRESHOLD = 0.99
+MIN_ROWS_PER_LEVEL = 5
+MAX_SAMPLE_ROWS = 200_000
+
+
+# --------------------------------------------------
+# GROUPED PURITY (codes)
+# --------------------------------------------------
+def batched_purity(codes, n_levels, y, n_classes):
+    """
+    For every column: share of rows whose target equals the majority
+    target of their feature level.
+    """
+
+    n_rows, n_cols = codes.shape
+
+    offsets = np.arange(n_cols, dtype=np.int64) * (n_levels * n_classes)
+    idx = offsets + codes * n_classes + y[:, None]
+
+    joint = np.bincount(
+        idx.ravel(), minlength=n_cols * n_levels * n_classes
+    ).reshape(n_cols, n_levels, n_classes)
+
+    return joint.max(axis=2).sum(axis=1) / n_rows
+
+
+def rows_per_level(codes, n_levels):
+    """
+    Average number of rows per used level, for every column.
+    Identifier-like columns are trivially pure and score low here.
+    """
+
+    n_rows, n_cols = codes.shape
+
+    idx = np.arange(n_cols, dtype=np.int64) * n_levels + codes
+    counts = np.bincount(idx.ravel(), minlength=n_cols * n_levels)
+
+    used = (counts.reshape(n_cols, n_levels) > 0).sum(axis=1)
+
+    return n_rows / np.maximum(used, 1)
+
+
+# --------------------------------------------------
+# SINGLE FEATURE AUC / RANK CORRELATION (numerics)
+# --------------------------------------------------
+def batched_auc(X, positive):
+    """
+    Single-feature ROC AUC for every column (Mann-Whitney on ranks).
+    NaN rows are ignored per column. Returns max(AUC, 1 - AUC).
+    """
+
+    ranks = pd.DataFrame(X).rank(method="average").to_numpy()
+    valid = ~np.isnan(ranks)
+
+    pos = positive[:, None] & valid
+    n_pos = pos.sum(axis=0)
+    n_neg = valid.sum(axis=0) - n_pos
+
+    rank_sum = np.where(pos, ranks, 0.0).sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        auc = (rank_sum - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+    return np.maximum(auc, 1 - auc)
+
+
+def batched_rank_correlation(X, y):
+    """
+    |Spearman correlation| between every column of X and y.
+    """
+
+    ranks = pd.DataFrame(X).rank(method="average")
+    y_rank = pd.Series(y).rank(method="average")
+
+    return np.abs(ranks.corrwith(y_rank).to_numpy())
+
+
+# --------------------------------------------------
+# LEAKAGE DETECTOR
+# --------------------------------------------------
+def _flag(method, score):
+    return {
+        "rule": "target_leakage",
+        "method": method,
+        "score": float(score),
+    }
+
+
+def detect_leakage(df, target, max_rows=MAX_SAMPLE_ROWS):
+    """
+    Flags features with near-perfect target purity.
+
+        classification : grouped target purity on codes,
+                         single-feature AUC for numerics (binary target)
+        regression     : correlation ratio on codes,
+                         rank correlation for numerics
+
+    Returns:
+        {column: flag}
+    """
+
+    if target is None or target not in df.columns:
+        return {}
+
+    df = sample_rows(df, max_rows)
+    df = df[df[target].notna()]
+
+    if len(df) < 2 * MIN_ROWS_PER_LEVEL:
+        return {}
+
+    y_raw = df[target]
+    y, n_classes = target_codes(y_raw)
+    regression = is_regression_target(y_raw)
+
+    features = [c for c in df.columns if c != target]
+    numeric = [c for c in features if pd.api.types.is_numeric_dtype(df[c])]
+    nunique = df[features].nunique(dropna=True)
+
+    # discrete columns are judged by level purity, continuous by ranks
+    discrete = [c for c in features if c not in numeric or nunique[c] < MAX_LEVELS]
+    continuous = [c for c in numeric if c not in discrete]
+
+    flags = {}
+
+    if discrete:
+        codes, n_levels = level_codes(df, discrete)
+        support = rows_per_level(codes, n_levels)
+
+        if regression:
+            values = np.broadcast_to(
+                y_raw.to_numpy(dtype=np.float64)[:, None], codes.shape
+            )
+            score = batched_correlation_ratio(codes, n_levels, values)
+            method = "correlation_ratio"
+        else:
+            score = batched_purity(codes, n_levels, y, n_classes)
+            method = "target_purity"
+
+            # a target that is already 99% one class is trivially pure
+            majority = np.bincount(y).max() / len(y)
+            score = np.where(majority < PURITY_THRESHOLD, score, np.nan)
+
+        for j, c in enumerate(discrete):
+            if support[j] >= MIN_ROWS_PER_LEVEL and score[j] >= PURITY_THRESHOLD:
+                flags[c] = _flag(method, score[j])
+
+    if continuous:
+        X = df[continuous].to_numpy(dtype=np.float64)
+        X[~np.isfinite(X)] = np.nan
+
+        if regression:
+            score = batched_rank_correlation(X, y_raw.to_numpy(dtype=np.float64))
+            method, threshold = "rank_correlation", RANK_CORR_THRESHOLD
+
+        elif n_classes == 2:
+            score = batched_auc(X, y == 1)
+            method, threshold = "single_feature_auc", AUC_THRESHOLD
+
+        else:
+            codes, n_levels = histogram_codes(X)
+            score = batched_purity(codes, n_levels, y, n_classes)
+            method, threshold = "binned_target_purity", PURITY_THRESHOLD
+
+        for j, c in enumerate(continuous):
+            if score[j] >= threshold:
+                flags[c] = _flag(method, score[j])
+
+    return flags
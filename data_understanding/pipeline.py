@@ -1,5 +1,5 @@
 from .loader import load_dataset
-from .semantic_reader import get_semantic_mapping
+from .semantic_reader import get_semantic_mapping, semantic_mapping_from_schema_result
 from .column_profiler import *
 from .exporter import export_column_inspection
 from .feature_relationships import (
@@ -9,11 +9,27 @@ from .feature_relationships import (
     feature_dependency_graph,
     pruning_plan
 )
+from .categorical_associations import categorical_association_pairs
+from .target_screening import screen_features
+from .leakage import detect_leakage
+from .quality_rules import run_quality_rules
+from artifact_store import dataset_content_hash
 
-def run_data_understanding(dataset_path):
+def inspect_dataset(dataset_path, schema_result=None):
+    """
+    Full column inspection record (the column_inspection.jsonl line).
+
+    schema_result : run_schema_inference output for this dataset.
+                    When given, the semantic mapping is taken from it
+                    instead of being looked up in data/.
+    """
 
     df = load_dataset(dataset_path)
-    semantic_map, target = get_semantic_mapping(dataset_path)
+
+    if schema_result is not None:
+        semantic_map, target = semantic_mapping_from_schema_result(schema_result)
+    else:
+        semantic_map, target = get_semantic_mapping(dataset_path)
 
     column_records = []
 
@@ -21,10 +37,31 @@ def run_data_understanding(dataset_path):
     # FEATURE RELATIONSHIPS
     # --------------------------------
     corr_pairs = correlation_pairs(df, min_abs_corr=0.0)
-    redundant = redundant_features(df)
+    cat_pairs = categorical_association_pairs(df)
+    redundant = redundant_features(df, categorical_pairs=cat_pairs)
     derived = derived_linear_relationships(df)
-    dependency_graph = feature_dependency_graph(df)
-    drop_recommendations = pruning_plan(df)
+    dependency_graph = feature_dependency_graph(df, categorical_pairs=cat_pairs)
+    drop_recommendations = pruning_plan(df, categorical_pairs=cat_pairs, target=target)
+
+    # --------------------------------
+    # TARGET SCREENING
+    # --------------------------------
+    target_relevance = screen_features(df, target)
+
+    # --------------------------------
+    # DATA QUALITY FLAGS
+    # --------------------------------
+    quality_flags, quality_summary = run_quality_rules(df)
+    leakage = detect_leakage(df, target)
+
+    for col, flag in leakage.items():
+        quality_flags.setdefault(col, []).append(flag)
+
+    # --------------------------------
+    # STATISTICS (reused by preprocess_1 while the checksum matches)
+    # --------------------------------
+    statistics = column_statistics(df)
+    dataset_checksum = dataset_content_hash(dataset_path)
 
     for col in df.columns:
 
@@ -50,20 +87,29 @@ def run_data_understanding(dataset_path):
             "text_complexity": text_complexity(s),
             "category_imbalance": category_imbalance(s),
             "correlation_strength": correlation_strength(col, df),
+            "target_relevance": target_relevance.get(col),
             "transform_hint": transform_hint(s),
             "modeling_hint": modeling_hint(sem),
-            "data_quality_flags": None,
+            "data_quality_flags": quality_flags.get(col, []),
             "is_constant": is_constant(s),
+            "statistics": statistics.get(col),
         })
 
-    export_column_inspection(dataset_path, 
-        {"column_profiles": column_records,
+    return export_column_inspection(dataset_path,
+        {"dataset_checksum": dataset_checksum,
+        "column_profiles": column_records,
         "correlation_pairs": corr_pairs,
+        "categorical_association_pairs": cat_pairs,
         "redundant_features": redundant,
         "derived_relationships": derived,
         "dependency_graph": dependency_graph,
-        "drop_recommendations": drop_recommendations})
+        "drop_recommendations": drop_recommendations,
+        "data_quality_summary": quality_summary})
+
 
-    # print(dataset_path, column_records)
+def run_data_understanding(dataset_path, schema_result=None):
+    """
+    Column profiles of one dataset (see inspect_dataset).
+    """
 
-    return column_records
\ No newline at end of file
+    return inspect_dataset(dataset_path, schema_result)["column_profiles"]
\ No newline at end of file
@@ -0,0 +1,217 @@
+import re
+import time
+
+import pandas as pd
+import numpy as np
+
+
+SENTINEL_STRINGS = {
+    "?", "-", "--", "n/a", "na", "nan", "none", "null",
+    "missing", "unknown", "-999", "-9999", "999", "9999", "99999",
+}
+
+SENTINEL_NUMBERS = [-999, -9999, 999, 9999, 99999]
+
+NUMERIC_STRING_PATTERN = r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?"
+
+# columns with one of these name tokens cannot hold negative values
+# (singular forms; a trailing "s" on the token is ignored)
+NONNEGATIVE_NAME_HINTS = {
+    "age", "count", "price", "amount", "qty", "quantity", "minute",
+    "call", "duration", "length", "weight", "height", "income",
+    "salary", "charge",
+}
+
+# share of non-sentinel values that must look numeric
+NUMERIC_STRING_RATIO = 0.9
+
+RULES = [
+    "mixed_types",
+    "whitespace",
+    "sentinel_values",
+    "numeric_strings",
+    "constant_after_trim",
+    "impossible_negatives",
+]
+
+
+# --------------------------------------------------
+# STRING RULES (all object columns in one long array)
+# --------------------------------------------------
+def _string_cells(s):
+    """
+    Boolean mask of the cells of one column that hold a str.
+    str-dtype columns hold nothing else; object columns are classified
+    by pandas' type inference, only mixed ones are checked per value.
+    """
+
+    if isinstance(s.dtype, pd.StringDtype):
+        return np.ones(len(s), dtype=bool)
+
+    kind = pd.api.types.infer_dtype(s, skipna=True)
+
+    if kind in ("string", "empty"):
+        return np.ones(len(s), dtype=bool)
+
+    if kind in ("mixed", "mixed-integer"):
+        return s.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+
+    return np.zeros(len(s), dtype=bool)
+
+
+def _string_rule_counts(df, cols):
+    """
+    Stacks every object column into one Series so each rule is a single
+    vectorised string mask, then aggregates per column with np.bincount.
+    """
+
+    n_cols = len(cols)
+    values = df[cols].to_numpy(dtype=object).ravel(order="F")
+    col_idx = np.repeat(np.arange(n_cols), len(df))
+
+    present = ~pd.isna(values)
+    values = values[present]
+    col_idx = col_idx[present]
+
+    # object columns may hold no strings at all (e.g. True/False/NaN),
+    # so the .str rules only run on the string cells
+    is_str = np.concatenate([_string_cells(df[c]) for c in cols])[present]
+
+    def per_column(mask):
+        return np.bincount(col_idx, weights=mask, minlength=n_cols).astype(np.int64)
+
+    # one str conversion for the string cells, str() for the rest
+    text = values.copy()
+    text[~is_str] = values[~is_str].astype(str)
+    strings = pd.Series(text[is_str])
+    stripped = strings.str.strip()
+
+    folded = stripped.str.lower()
+
+    lowered = text.copy()
+    lowered[is_str] = folded.to_numpy()
+
+    whitespace = np.zeros(len(values), dtype=bool)
+    whitespace[is_str] = (strings != stripped).to_numpy()
+
+    sentinel = np.zeros(len(values), dtype=bool)
+    sentinel[is_str] = folded.isin(SENTINEL_STRINGS).to_numpy()
+
+    numeric_like = np.zeros(len(values), dtype=bool)
+    numeric_like[is_str] = stripped.str.fullmatch(NUMERIC_STRING_PATTERN).to_numpy(dtype=bool)
+    numeric_like &= ~sentinel
+
+    # value kinds: non-string object / numeric-looking text / other text
+    kind = np.where(~is_str, 0, np.where(numeric_like, 1, 2))
+    kind_counts = np.bincount(
+        col_idx * 3 + kind, weights=~sentinel, minlength=n_cols * 3
+    ).reshape(n_cols, 3)
+
+    non_sentinel = kind_counts.sum(axis=1)
+    mixed = (non_sentinel - kind_counts.max(axis=1)).astype(np.int64)
+
+    numeric_strings = kind_counts[:, 1].astype(np.int64)
+    numeric_strings = np.where(
+        numeric_strings >= NUMERIC_STRING_RATIO * np.maximum(non_sentinel, 1),
+        numeric_strings,
+        0,
+    )
+
+    # distinct levels before and after trim/case folding
+    frame = pd.DataFrame({"col": col_idx, "raw": text, "norm": lowered})
+    levels = frame.groupby("col")[["raw", "norm"]].nunique()
+    raw_levels = levels["raw"].reindex(range(n_cols), fill_value=0).to_numpy()
+    norm_levels = levels["norm"].reindex(range(n_cols), fill_value=0).to_numpy()
+    constant_after_trim = np.where(
+        (raw_levels > 1) & (norm_levels == 1), raw_levels - 1, 0
+    )
+
+    return {
+        "mixed_types": mixed,
+        "whitespace": per_column(whitespace),
+        "sentinel_values": per_column(sentinel),
+        "numeric_strings": numeric_strings,
+        "constant_after_trim": constant_after_trim,
+    }
+
+
+# --------------------------------------------------
+# NUMERIC RULES (one matrix)
+# --------------------------------------------------
+def _name_tokens(name):
+    # "n_calls" -> n, calls; "TotalCharges" -> total, charges
+    spaced = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", str(name))
+    return [t.lower() for t in re.split(r"[\W_]+", spaced) if t]
+
+
+def _nonnegative_name(name):
+    return any(
+        t in NONNEGATIVE_NAME_HINTS or t.removesuffix("s") in NONNEGATIVE_NAME_HINTS
+        for t in _name_tokens(name)
+    )
+
+
+def _numeric_rule_counts(df, cols):
+
+    X = df[cols].to_numpy(dtype=np.float64)
+
+    lo = np.where(np.isnan(X), np.inf, X).min(axis=0)
+    hi = np.where(np.isnan(X), -np.inf, X).max(axis=0)
+
+    # sentinel codes only count when they sit at the edge of the range
+    sentinel = np.isin(X, SENTINEL_NUMBERS) & ((X == lo) | (X == hi))
+
+    nonnegative = np.array([_nonnegative_name(c) for c in cols])
+    negative = (X < 0) & ~sentinel & nonnegative
+
+    return {
+        "sentinel_values": sentinel.sum(axis=0),
+        "impossible_negatives": negative.sum(axis=0),
+    }
+
+
+# --------------------------------------------------
+# RULE ENGINE
+# --------------------------------------------------
+def run_quality_rules(df):
+    """
+    Evaluates every rule over all columns in batched passes.
+
+    Returns:
+        flags   : {column: [{"rule", "count"}, ...]}
+        summary : {rule: {"columns", "values"}, "elapsed_ms"}
+    """
+
+    start = time.perf_counter()
+
+    object_cols = list(df.select_dtypes(include=["object", "string"]).columns)
+    numeric_cols = list(df.select_dtypes(include="number").columns)
+
+    counts = {}
+
+    if object_cols:
+        for rule, values in _string_rule_counts(df, object_cols).items():
+            counts.setdefault(rule, {}).update(zip(object_cols, values))
+
+    if numeric_cols:
+        for rule, values in _numeric_rule_counts(df, numeric_cols).items():
+            counts.setdefault(rule, {}).update(zip(numeric_cols, values))
+
+    flags = {}
+    summary = {}
+
+    for rule in RULES:
+
+        hits = {c: int(n) for c, n in counts.get(rule, {}).items() if n > 0}
+
+        for c, n in hits.items():
+            flags.setdefault(c, []).append({"rule": rule, "count": n})
+
+        summary[rule] = {
+            "columns": len(hits),
+            "values": sum(hits.values()),
+        }
+
+    summary["elapsed_ms"] = (time.perf_counter() - start) * 1000
+
+    return flags, summary
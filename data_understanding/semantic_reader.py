@@ -1,24 +1,57 @@
-import json
 from pathlib import Path
 
+from artifact_store import latest_artifact, dataset_content_hash, latest_by_key
+
+
+def semantic_mapping_from_schema_result(schema_result):
+    """
+    Build (feature_mapping, target) straight from run_schema_inference output.
+    """
+
+    feature_mapping = {
+        col: {"role": info["role"], "confidence": info["confidence"]}
+        for col, info in schema_result["columns"].items()
+    }
+
+    return feature_mapping, schema_result["target"]
+
+
+def _scan_classification_log(log_path, dataset_path):
+    """
+    Legacy fallback: newest matching record in data_classification.jsonl
+    """
+
+    return latest_by_key(log_path, "dataset_file_path", [dataset_path]).get(dataset_path)
+
 
 def get_semantic_mapping(dataset_path):
     """
-    Find semantic classification for dataset from data_classification.jsonl
+    Find semantic classification for dataset.
+
+    Lookup order:
+        1. artifact store, newest record with same file content
+        2. artifact store, newest record with same resolved path
+        3. data_classification.jsonl, newest matching line
     """
 
     dataset_path = str(Path(dataset_path).resolve())
 
-    project_root = Path(__file__).resolve().parents[1]
-    log_path = project_root / "data" / "data_classification.jsonl"
+    rec = latest_artifact(
+        "schema",
+        dataset_hash=dataset_content_hash(dataset_path),
+        dataset_path=dataset_path,
+    )
+
+    if rec is None:
+        project_root = Path(__file__).resolve().parents[1]
+        log_path = project_root / "data" / "data_classification.jsonl"
+
+        if not log_path.exists():
+            raise FileNotFoundError("data_classification.jsonl not found")
 
-    if not log_path.exists():
-        raise FileNotFoundError("data_classification.jsonl not found")
+        rec = _scan_classification_log(log_path, dataset_path)
 
-    with open(log_path, "r", encoding="utf-8") as f:
-        for line in f:
-            rec = json.loads(line)
-            if rec["dataset_file_path"] == dataset_path:
-                return rec["feature_mapping"], rec["target_column"]
+    if rec is None:
+        raise ValueError("Dataset not found in data_classification.jsonl")
 
-    raise ValueError("Dataset not found in data_classification.jsonl")
\ No newline at end of file
+    return rec["feature_mapping"], rec["target_column"]
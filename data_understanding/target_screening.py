@@ -0,0 +1,249 @@
+import pandas as pd
+import numpy as np
+
+from .categorical_associations import sample_rows
+
+
+N_BINS = 16
+MAX_LEVELS = 64
+MAX_TARGET_CLASSES = 20
+MAX_SAMPLE_ROWS = 200_000
+
+
+# --------------------------------------------------
+# TARGET ENCODING
+# --------------------------------------------------
+def is_regression_target(y):
+    return pd.api.types.is_numeric_dtype(y) and y.nunique(dropna=True) > MAX_TARGET_CLASSES
+
+
+def target_codes(y, n_bins=N_BINS):
+    """
+    Integer codes for the target.
+        classification : one code per class
+        regression     : quantile bins
+    Missing target rows get -1 and are excluded everywhere.
+    """
+
+    if is_regression_target(y):
+        codes = pd.qcut(y, q=n_bins, labels=False, duplicates="drop")
+        codes = codes.fillna(-1).to_numpy(dtype=np.int64)
+    else:
+        codes, _ = pd.factorize(y, use_na_sentinel=True)
+        codes = codes.astype(np.int64)
+
+    return codes, int(codes.max()) + 1
+
+
+# --------------------------------------------------
+# FEATURE CODES (batched)
+# --------------------------------------------------
+def histogram_codes(X, n_bins=N_BINS):
+    """
+    Equal-width histogram bins for every column of X at once.
+    Missing values go to an extra bin (n_bins).
+    """
+
+    missing = ~np.isfinite(X)
+
+    lo = np.where(missing, np.inf, X).min(axis=0)
+    hi = np.where(missing, -np.inf, X).max(axis=0)
+    width = np.where(hi > lo, hi - lo, 1.0)
+
+    with np.errstate(invalid="ignore"):
+        codes = np.floor((X - lo) / width * n_bins)
+
+    codes = np.clip(np.nan_to_num(codes), 0, n_bins - 1).astype(np.int64)
+    codes[missing] = n_bins
+
+    return codes, n_bins + 1
+
+
+def level_codes(df, cols, max_levels=MAX_LEVELS):
+    """
+    Integer codes for categorical columns.
+    The most frequent max_levels-1 levels are kept, the rest share one code.
+    Missing values get their own code.
+    """
+
+    codes = np.empty((len(df), len(cols)), dtype=np.int64)
+
+    for j, c in enumerate(cols):
+        col_codes, uniques = pd.factorize(df[c], use_na_sentinel=True)
+
+        if len(uniques) >= max_levels:
+            counts = np.bincount(col_codes[col_codes >= 0], minlength=len(uniques))
+            rank = np.empty(len(uniques), dtype=np.int64)
+            rank[np.argsort(-counts, kind="stable")] = np.arange(len(uniques))
+            col_codes = np.where(
+                col_codes >= 0, np.minimum(rank[col_codes], max_levels - 2), col_codes
+            )
+
+        col_codes[col_codes < 0] = max_levels - 1
+        codes[:, j] = col_codes
+
+    return codes, max_levels
+
+
+# --------------------------------------------------
+# BATCHED STATISTICS
+# --------------------------------------------------
+def _entropy_rows(counts):
+    """
+    Entropy of each row of a count matrix (nats).
+    """
+
+    n = counts.sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(n > 0, counts / n, 0.0)
+        logp = np.where(p > 0, np.log(p), 0.0)
+    return -(p * logp).sum(axis=-1)
+
+
+def batched_mutual_information(codes, n_levels, y, n_classes):
+    """
+    Mutual information between every column of codes and y.
+
+    All joint tables come from a single np.bincount over
+    (column offset, feature code, target code).
+    Miller-Madow corrected so empty/sparse bins do not inflate MI.
+    """
+
+    n_rows, n_cols = codes.shape
+
+    offsets = np.arange(n_cols, dtype=np.int64) * (n_levels * n_classes)
+    idx = offsets + codes * n_classes + y[:, None]
+
+    joint = np.bincount(
+        idx.ravel(), minlength=n_cols * n_levels * n_classes
+    ).reshape(n_cols, n_levels, n_classes)
+
+    h_x = _entropy_rows(joint.sum(axis=2))
+    h_y = _entropy_rows(joint.sum(axis=1))
+    h_xy = _entropy_rows(joint.reshape(n_cols, -1))
+
+    nonzero_x = (joint.sum(axis=2) > 0).sum(axis=1)
+    nonzero_y = (joint.sum(axis=1) > 0).sum(axis=1)
+    nonzero_xy = (joint > 0).sum(axis=(1, 2))
+    bias = (nonzero_xy - nonzero_x - nonzero_y + 1) / (2 * n_rows)
+
+    return np.maximum(h_x + h_y - h_xy - bias, 0.0), h_y
+
+
+def batched_correlation_ratio(groups, n_groups, values):
+    """
+    Correlation ratio eta(values | groups) for every column at once.
+
+    groups : int matrix (n_rows, n_cols)
+    values : float matrix (n_rows, n_cols), NaN rows are ignored
+    """
+
+    n_rows, n_cols = groups.shape
+
+    valid = ~np.isnan(values)
+    v = np.where(valid, values, 0.0)
+    w = valid.astype(np.float64)
+
+    idx = (np.arange(n_cols, dtype=np.int64) * n_groups + groups).ravel()
+    size = n_cols * n_groups
+
+    counts = np.bincount(idx, weights=w.ravel(), minlength=size).reshape(n_cols, n_groups)
+    sums = np.bincount(idx, weights=v.ravel(), minlength=size).reshape(n_cols, n_groups)
+
+    n = counts.sum(axis=1)
+    total = sums.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grand_mean = total / n
+        group_mean = np.where(counts > 0, sums / counts, 0.0)
+
+        ss_between = (counts * (group_mean - grand_mean[:, None]) ** 2).sum(axis=1)
+        ss_total = (w * (v - grand_mean) ** 2).sum(axis=0)
+
+        eta = np.sqrt(ss_between / ss_total)
+
+    return np.where(np.isfinite(eta), np.clip(eta, 0.0, 1.0), np.nan)
+
+
+# --------------------------------------------------
+# SCREENING STAGE
+# --------------------------------------------------
+def screen_features(df, target, max_rows=MAX_SAMPLE_ROWS):
+    """
+    Target-aware relevance for every feature.
+
+    Returns:
+        {column: {"mutual_information", "normalized_mi", "correlation_ratio"}}
+
+        numeric     : histogram-binned MI, eta over target classes
+                      (regression: eta of target over feature bins)
+        categorical : code-based MI, eta of target over levels (regression)
+    """
+
+    if target is None or target not in df.columns:
+        return {}
+
+    df = sample_rows(df, max_rows)
+    df = df[df[target].notna()]
+
+    if len(df) < 2:
+        return {}
+
+    y_raw = df[target]
+    y, n_classes = target_codes(y_raw)
+    regression = is_regression_target(y_raw)
+
+    keep = y >= 0
+    df = df[keep]
+    y = y[keep]
+    y_values = y_raw[keep].to_numpy(dtype=np.float64) if regression else None
+
+    features = [c for c in df.columns if c != target]
+    numeric = [c for c in features if pd.api.types.is_numeric_dtype(df[c])]
+    categorical = [c for c in features if c not in numeric]
+
+    results = {}
+
+    if numeric:
+        X = df[numeric].to_numpy(dtype=np.float64)
+        X[~np.isfinite(X)] = np.nan
+        codes, n_levels = histogram_codes(X)
+        mi, h_y = batched_mutual_information(codes, n_levels, y, n_classes)
+
+        if regression:
+            values = np.broadcast_to(y_values[:, None], X.shape)
+            eta = batched_correlation_ratio(codes, n_levels, values)
+        else:
+            eta = batched_correlation_ratio(
+                np.broadcast_to(y[:, None], X.shape), n_classes, X
+            )
+
+        results.update(_pack(numeric, mi, h_y, eta))
+
+    if categorical:
+        codes, n_levels = level_codes(df, categorical)
+        mi, h_y = batched_mutual_information(codes, n_levels, y, n_classes)
+
+        if regression:
+            values = np.broadcast_to(y_values[:, None], codes.shape)
+            eta = batched_correlation_ratio(codes, n_levels, values)
+        else:
+            eta = np.full(len(categorical), np.nan)
+
+        results.update(_pack(categorical, mi, h_y, eta))
+
+    return results
+
+
+def _pack(cols, mi, h_y, eta):
+
+    out = {}
+
+    for j, c in enumerate(cols):
+        out[c] = {
+            "mutual_information": float(mi[j]),
+            "normalized_mi": float(mi[j] / h_y[j]) if h_y[j] > 0 else 0.0,
+            "correlation_ratio": None if np.isnan(eta[j]) else float(eta[j]),
+        }
+
+    return out
@@ -0,0 +1,143 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+from pathlib import Path
+
+try:
+    import xxhash
+except ImportError:  # optional, blake2b is the fallback fast hash
+    xxhash = None
+
+# --------------------------------------------------
+# Cached file fingerprints
+# --------------------------------------------------
+# Digests are cached by (path, size, mtime_ns, inode, algo), so an
+# unchanged file is hashed once across all stages and runs.
+PROJECT_ROOT = Path(__file__).resolve().parents[0]
+CACHE_PATH = PROJECT_ROOT / "data" / "fingerprints.sqlite"
+
+# read granularity for hashing (hashlib releases the GIL on large updates)
+READ_SIZE = 8 << 20
+
+DEFAULT_ALGO = "sha256"
+
+# identity checks only: not stable across algorithm choice, never persist
+# it where a sha256 is expected
+FAST_ALGO = "xxh3_128" if xxhash is not None else "blake2b"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    path      TEXT NOT NULL,
+    algo      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    inode     INTEGER NOT NULL,
+    digest    TEXT NOT NULL,
+    PRIMARY KEY (path, algo)
+);
+"""
+
+# in-process layer in front of the sqlite cache
+_memo = {}
+
+
+def _new_hasher(algo):
+    if algo == "sha256":
+        return hashlib.sha256()
+    if algo == "blake2b":
+        return hashlib.blake2b(digest_size=16)
+    if algo == "xxh3_128" and xxhash is not None:
+        return xxhash.xxh3_128()
+    raise ValueError(f"Unsupported fingerprint algorithm: {algo}")
+
+
+def _hash_file(path, algo, size):
+    h = _new_hasher(algo)
+
+    if size == 0:
+        return h.hexdigest()
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, size, READ_SIZE):
+                    h.update(view[start:start + READ_SIZE])
+            finally:
+                view.release()
+
+    return h.hexdigest()
+
+
+def _connect(cache_path):
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(cache_path, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _cached(conn, key):
+    path, algo, size, mtime_ns, inode = key
+    row = conn.execute(
+        "SELECT digest FROM fingerprints "
+        "WHERE path = ? AND algo = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+        (path, algo, size, mtime_ns, inode),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def file_fingerprint(path, algo=DEFAULT_ALGO, cache_path=CACHE_PATH):
+    """
+    Hex digest of the file content, None if the file is missing.
+
+    algo: "sha256" (default, stable identity stored in logs),
+          "blake2b" / "xxh3_128" (faster, FAST_ALGO picks the best available)
+    """
+
+    p = Path(path)
+
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+
+    key = (str(p.resolve()), algo, st.st_size, st.st_mtime_ns, st.st_ino)
+
+    if key in _memo:
+        return _memo[key]
+
+    conn = _connect(cache_path) if cache_path else None
+
+    try:
+        digest = _cached(conn, key) if conn else None
+
+        if digest is None:
+            digest = _hash_file(p, algo, st.st_size)
+
+            if conn:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO fingerprints "
+                        "(path, algo, size, mtime_ns, inode, digest) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (*key, digest),
+                    )
+    finally:
+        if conn:
+            conn.close()
+
+    _memo[key] = digest
+    return digest
+
+
+def fast_fingerprint(path):
+    return file_fingerprint(path, algo=FAST_ALGO)
+
+
+def clear_fingerprint_cache(cache_path=CACHE_PATH):
+    _memo.clear()
+    if Path(cache_path).exists():
+        os.remove(cache_path)
@@ -0,0 +1,242 @@
+import json
+import math
+import os
+import platform
+import time
+from pathlib import Path
+
+import numpy as np
+import sklearn
+from sklearn.cluster import DBSCAN, KMeans
+
+from preprocess_1.design_matrix import DENSE_MAX_BYTES
+from .racing import _estimator, RANDOM_STATE
+
+
+# --------------------------------------------------
+# COST MODEL SETTINGS
+# --------------------------------------------------
+# Training time = work units (a complexity formula per registry entry)
+# x seconds per unit measured once on this machine by a micro-benchmark.
+# Peak memory comes from the formulas alone.
+
+CALIBRATION_PATH = Path("data/cost_calibration.json")
+
+CALIBRATION_ROWS = 2_000
+CALIBRATION_FEATURES = 20
+
+# used for models that cannot be benchmarked here (not installed)
+DEFAULT_SECONDS_PER_UNIT = 5e-9
+
+# speed-up of each extra core for models that train in parallel
+CORE_EFFICIENCY = 0.7
+
+BUDGET_MODES = ("penalize", "exclude")
+
+
+# --------------------------------------------------
+# COMPLEXITY (n rows, w encoded width, z non-zeros per row)
+# --------------------------------------------------
+
+def _dense(n, w):
+    return n * w * 4 <= DENSE_MAX_BYTES
+
+
+def _matrix_bytes(n, w, z):
+    # float32 dense, or CSR data + indices + indptr
+    return n * w * 4 if _dense(n, w) else n * z * 8 + n * 8
+
+
+def _forest_work(n, w, z, problem_type):
+    # 100 trees; classifiers try sqrt(w) features per split, regressors all
+    tried = math.sqrt(w) if problem_type == "classification" else w
+    return 100 * n * math.log2(max(n, 2)) * tried
+
+
+def _boosting_work(n, w, z, problem_type):
+    # 200 rounds of histogram building over the non-zeros
+    return 200 * n * z
+
+
+def _linear_regression_work(n, w, z, problem_type):
+    return n * w * w if _dense(n, w) else 100 * n * z
+
+
+COSTS = {
+    "random_forest": dict(
+        work=_forest_work,
+        # ~1.3 n nodes per fully grown bootstrap tree, ~64 bytes each
+        memory=lambda n, w, z: _matrix_bytes(n, w, z) + 100 * 1.3 * n * 64,
+        parallel=True
+    ),
+    "xgboost": dict(
+        work=_boosting_work,
+        memory=lambda n, w, z: _matrix_bytes(n, w, z) + n * z * 4,
+        parallel=True
+    ),
+    "lightgbm": dict(
+        work=_boosting_work,
+        memory=lambda n, w, z: _matrix_bytes(n, w, z) + n * z * 4,
+        parallel=True
+    ),
+    "logistic_regression": dict(
+        work=lambda n, w, z, p: 100 * n * z,
+        memory=lambda n, w, z: 2 * _matrix_bytes(n, w, z),
+        parallel=False
+    ),
+    "linear_regression": dict(
+        work=_linear_regression_work,
+        memory=lambda n, w, z: (
+            n * w * 8 + w * w * 8 if _dense(n, w) else 2 * _matrix_bytes(n, w, z)
+        ),
+        parallel=False
+    ),
+    "kmeans": dict(
+        # 8 clusters, up to 100 Lloyd iterations (threaded, as benchmarked)
+        work=lambda n, w, z, p: 8 * 100 * n * z,
+        memory=lambda n, w, z: 2 * _matrix_bytes(n, w, z) + n * 8,
+        parallel=False
+    ),
+    "dbscan": dict(
+        # one radius query per row; pessimistic for low-width tree queries
+        work=lambda n, w, z, p: n * n * z,
+        # neighbourhood lists dominate; grows faster than linear in n
+        memory=lambda n, w, z: _matrix_bytes(n, w, z) + n * math.sqrt(n) * 8,
+        parallel=False
+    ),
+}
+
+
+# --------------------------------------------------
+# CALIBRATION
+# --------------------------------------------------
+
+_calibration = None
+
+
+def _machine():
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "sklearn": sklearn.__version__,
+    }
+
+
+def _bench_estimator(model, problem_type):
+    if model == "kmeans":
+        return KMeans(n_clusters=8, n_init=1, random_state=RANDOM_STATE)
+    if model == "dbscan":
+        return DBSCAN()
+    return _estimator(model, problem_type)
+
+
+def _benchmark(model):
+    """
+    Seconds per work unit, from one fit on a small synthetic problem.
+    """
+
+    problem_type = "regression" if model == "linear_regression" else "classification"
+
+    est = _bench_estimator(model, problem_type)
+    if est is None:
+        return None
+
+    rng = np.random.default_rng(RANDOM_STATE)
+    X = rng.standard_normal((CALIBRATION_ROWS, CALIBRATION_FEATURES)).astype(np.float32)
+    signal = X[:, 0] + X[:, 1] ** 2
+    y = signal if problem_type == "regression" else (signal > 1).astype(np.int64)
+
+    t = time.perf_counter()
+    est.fit(X, y)
+    elapsed = time.perf_counter() - t
+
+    work = COSTS[model]["work"](CALIBRATION_ROWS, CALIBRATION_FEATURES, CALIBRATION_FEATURES, problem_type)
+
+    return elapsed / work
+
+
+def calibrate(path=CALIBRATION_PATH, refresh=False):
+    """
+    {model: seconds per work unit} for this machine. Benchmarked once and
+    cached to JSON; rerun when the machine or library versions change.
+    """
+
+    global _calibration
+
+    machine = _machine()
+
+    if _calibration is not None and _calibration["machine"] == machine and not refresh:
+        return _calibration["seconds_per_unit"]
+
+    path = Path(path)
+
+    if path.exists() and not refresh:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("machine") == machine:
+            _calibration = cached
+            return cached["seconds_per_unit"]
+
+    seconds_per_unit = {}
+    for model in COSTS:
+        try:
+            spu = _benchmark(model)
+        except Exception as e:
+            print(f"[COST WARNING] benchmark {model}: {e}")
+            spu = None
+        if spu is not None:
+            seconds_per_unit[model] = spu
+
+    _calibration = {
+        "machine": machine,
+        "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seconds_per_unit": seconds_per_unit,
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_calibration, f, indent=2)
+
+    return seconds_per_unit
+
+
+# --------------------------------------------------
+# PUBLIC
+# --------------------------------------------------
+
+def estimate_cost(model, char, problem_type, cores=None):
+    """
+    Predicted training time (s) and peak memory (MB) of one registry
+    model on a dataset, from its encoded width and sparsity.
+    """
+
+    n = max(1, char["n_rows"])
+    w = max(1, char.get("encoded_width") or char["n_features"])
+    z = max(1.0, w * char.get("encoded_density", 1.0))
+
+    cost = COSTS[model]
+    spu = calibrate().get(model, DEFAULT_SECONDS_PER_UNIT)
+
+    cores = cores or os.cpu_count() or 1
+    speedup = 1 + CORE_EFFICIENCY * (cores - 1) if cost["parallel"] else 1
+
+    return {
+        "train_s": round(cost["work"](n, w, z, problem_type) * spu / speedup, 3),
+        "memory_mb": round(cost["memory"](n, w, z) / 2 ** 20, 1),
+    }
+
+
+def within_budget(estimate, budget):
+    """
+    budget: {"max_train_s", "max_memory_mb"}; a missing limit is unlimited.
+    """
+
+    max_s = budget.get("max_train_s")
+    max_mb = budget.get("max_memory_mb")
+
+    return (
+        (max_s is None or estimate["train_s"] <= max_s)
+        and (max_mb is None or estimate["memory_mb"] <= max_mb)
+    )
@@ -1,3 +1,55 @@
+from preprocess_1.encoding import HASH_THRESHOLD, HASH_FEATURES, TEXT_FEATURES
+
+# rough token count of a free-text cell (non-zeros per row after hashing)
+TEXT_TOKENS_PER_ROW = 20
+
+
+def encoded_width(dataset):
+    """
+    Estimated model-matrix width and non-zeros per row once deferred
+    encodings are applied: fitted params when the preprocess record has
+    them, profiled cardinality otherwise.
+    """
+
+    pre = dataset.get("preprocess_record") or {}
+    profiles = {c["column_name"]: c for c in dataset["column_profiles"]}
+    target = dataset.get("target_column")
+
+    # same precedence as preprocess_1.encoding.encoding_actions
+    encoded = {}
+    for d in pre.get("deferred", []):
+        if d["strategy"] == "text_vectorization":
+            encoded[d["column"]] = d
+        elif d["strategy"] == "encoding" and d["column"] not in encoded:
+            encoded[d["column"]] = d
+
+    width = nnz = 0
+
+    for col, d in encoded.items():
+        params = d.get("params") or {}
+
+        if d["strategy"] == "text_vectorization":
+            width += params.get("n_features", TEXT_FEATURES)
+            nnz += TEXT_TOKENS_PER_ROW
+            continue
+
+        if params.get("method") == "onehot":
+            width += len(params["categories"])
+        elif params.get("method") == "hash":
+            width += params["n_features"]
+        else:
+            levels = round((profiles.get(col, {}).get("unique_ratio") or 0) * dataset["n_rows"])
+            width += max(1, levels) if levels <= HASH_THRESHOLD else HASH_FEATURES
+        nnz += 1
+
+    numeric = sum(
+        1 for c, p in profiles.items()
+        if c != target and c not in encoded and "numeric" in (p.get("semantic_type") or "")
+    )
+
+    return numeric + width, numeric + nnz
+
+
 def compute_characteristics(dataset):
 
     cp = dataset["column_profiles"]
@@ -10,6 +62,8 @@ def compute_characteristics(dataset):
         1 for c in cp if (c.get("correlation_strength") or 0) > 0.7
     )
 
+    width, nnz = encoded_width(dataset)
+
     return {
         "n_rows": dataset["n_rows"],
         "n_features": dataset["n_columns"],
@@ -20,5 +74,7 @@ def compute_characteristics(dataset):
         },
         "correlation_density": strong_corr / max(1, len(cp)),
         "missing_ratio": dataset.get("overall_missing_ratio", 0),
-        "dimensionality_ratio": dataset["n_columns"] / max(1, dataset["n_rows"])
-    }
\ No newline at end of file
+        "dimensionality_ratio": dataset["n_columns"] / max(1, dataset["n_rows"]),
+        "encoded_width": width,
+        "encoded_density": round(nnz / max(1, width), 6)
+    }
@@ -1,18 +1,12 @@
-import json
 from pathlib import Path
 
+from artifact_store import tail_jsonl, latest_by_key
+
 COLUMN_INSPECTION_PATH = Path("data/column_inspection.jsonl")
 PREPROCESS_LOG_PATH = Path("data/preprocesses_1.jsonl")
 CLASSIFICATION_PATH = Path("data/data_classification.jsonl")
 
 
-def read_jsonl(path):
-    if not path.exists():
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        return [json.loads(l) for l in f]
-
-
 def extract_preprocessing(pre_record):
     return {
         "steps": pre_record.get("steps", []),
@@ -21,11 +15,47 @@ def extract_preprocessing(pre_record):
     }
 
 
-def load_datasets(last_n):
+def classification_from_schema(schema_result):
+    """
+    The data_classification.jsonl fields used here, from run_schema_inference output.
+    """
+
+    return {
+        "dataset_file_path": schema_result["dataset_file_path"],
+        "n_rows": schema_result["n_rows"],
+        "n_columns": schema_result["n_columns"],
+        "target_column": schema_result["target"]
+    }
+
+
+def _by_path(records):
+    return {r["dataset_file_path"]: r for r in records}
+
+
+def load_datasets(last_n, preprocess_records=None, inspections=None, classifications=None):
+    """
+    Last n preprocess runs joined with the newest column inspection and
+    classification record of the same dataset. Logs are read from the
+    end and only until every needed dataset has been found.
+
+    Records passed in memory (graph run) are used instead of the
+    corresponding log.
+    """
+
+    preprocess = (
+        preprocess_records if preprocess_records is not None
+        else tail_jsonl(PREPROCESS_LOG_PATH, last_n)
+    )
+    paths = {pre["dataset_path"] for pre in preprocess}
 
-    preprocess = read_jsonl(PREPROCESS_LOG_PATH)[-last_n:]
-    columns = read_jsonl(COLUMN_INSPECTION_PATH)
-    classes = read_jsonl(CLASSIFICATION_PATH)
+    columns = (
+        _by_path(inspections) if inspections is not None
+        else latest_by_key(COLUMN_INSPECTION_PATH, "dataset_file_path", paths)
+    )
+    classes = (
+        _by_path(classifications) if classifications is not None
+        else latest_by_key(CLASSIFICATION_PATH, "dataset_file_path", paths)
+    )
 
     datasets = []
 
@@ -33,8 +63,8 @@ def load_datasets(last_n):
 
         path = pre["dataset_path"]
 
-        col = next((r for r in columns if r["dataset_file_path"] == path), None)
-        cls = next((r for r in classes if r["dataset_file_path"] == path), None)
+        col = columns.get(path)
+        cls = classes.get(path)
 
         if not col or not cls:
             continue
@@ -44,6 +74,7 @@ def load_datasets(last_n):
             "raw_dataset_path": path,
             "preprocessed_file_path": pre["output_file_path"],
             "preprocessing": extract_preprocessing(pre),
+            "preprocess_record": pre,
             "column_profiles": col["column_profiles"],
             "target_column": cls.get("target_column"),
             "n_rows": cls["n_rows"],
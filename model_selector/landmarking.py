@@ -0,0 +1,145 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.model_selection import train_test_split
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+
+from preprocess_1.design_matrix import sample_design_matrix
+from .racing import RACE_METRICS, RANDOM_STATE, _score, _stratify, labelled_rows
+
+
+# --------------------------------------------------
+# LANDMARK SETTINGS
+# --------------------------------------------------
+
+# rows used by all probes, whatever the dataset size
+LANDMARK_ROWS = 2_000
+HOLDOUT_FRACTION = 0.3
+
+# GaussianNB needs dense input; wider sparse matrices skip it
+MAX_DENSE_WIDTH = 1_000
+
+
+# --------------------------------------------------
+# PROBES
+# --------------------------------------------------
+
+def _impute():
+    return SimpleImputer(strategy="median", keep_empty_features=True)
+
+
+def _probes(problem_type, is_sparse):
+
+    classify = problem_type == "classification"
+
+    probes = {
+        "decision_stump": make_pipeline(
+            _impute(),
+            (DecisionTreeClassifier if classify else DecisionTreeRegressor)(
+                max_depth=1, random_state=RANDOM_STATE
+            )
+        ),
+        "nearest_neighbor": make_pipeline(
+            _impute(),
+            StandardScaler(with_mean=not is_sparse),
+            (KNeighborsClassifier if classify else KNeighborsRegressor)(n_neighbors=1)
+        ),
+        "linear": make_pipeline(
+            _impute(),
+            StandardScaler(with_mean=not is_sparse),
+            LogisticRegression(max_iter=200) if classify else Ridge(alpha=1.0)
+        ),
+    }
+
+    if classify and not is_sparse:
+        probes["naive_bayes"] = make_pipeline(_impute(), GaussianNB())
+
+    return probes
+
+
+def _run_probe(probe, X_tr, y_tr, X_te, y_te, problem_type):
+    t = time.perf_counter()
+    probe.fit(X_tr, y_tr)
+    score = _score(problem_type, y_te, probe.predict(X_te))
+    return score, (time.perf_counter() - t) * 1000
+
+
+# --------------------------------------------------
+# PUBLIC
+# --------------------------------------------------
+
+def compute_landmarks(dataset, problem_type, n_rows=LANDMARK_ROWS):
+    """
+    Holdout scores of cheap probes (decision stump, naive Bayes, 1-NN,
+    standardised linear model) on a bounded subsample, fitted in parallel.
+    The subsample is read and encoded straight from the preprocessed
+    output, so the cost does not grow with the dataset.
+
+    Returns None when the problem is not supervised or no labelled
+    preprocessed data is available.
+    """
+
+    record = dataset.get("preprocess_record")
+
+    if problem_type not in RACE_METRICS or record is None:
+        return None
+
+    start = time.perf_counter()
+
+    X, y, target_info = sample_design_matrix(
+        {**record, "target": record.get("target") or dataset.get("target_column")},
+        n_rows, random_state=RANDOM_STATE
+    )
+
+    if y is None:
+        return None
+
+    idx = labelled_rows(y, target_info)
+    if len(idx) < 20:
+        return None
+
+    X = X[idx]
+    y = np.asarray(y[idx])
+
+    is_sparse = sparse.issparse(X)
+    if is_sparse and X.shape[1] <= MAX_DENSE_WIDTH:
+        X, is_sparse = X.toarray(), False
+
+    X_tr, X_te, y_tr, y_te = train_test_split(
+        X, y, test_size=HOLDOUT_FRACTION, random_state=RANDOM_STATE,
+        stratify=_stratify(y, problem_type)
+    )
+
+    probes = _probes(problem_type, is_sparse)
+
+    # probes are milliseconds each: threads, no process start-up cost
+    with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+        futures = {
+            name: pool.submit(_run_probe, p, X_tr, y_tr, X_te, y_te, problem_type)
+            for name, p in probes.items()
+        }
+
+    scores = {}
+    timings = {}
+
+    for name, f in futures.items():
+        try:
+            scores[name], timings[name] = f.result()
+        except Exception as e:
+            print(f"[LANDMARK WARNING] {name}: {e}")
+
+    return {
+        "metric": RACE_METRICS[problem_type],
+        "n_rows": int(len(idx)),
+        "scores": scores,
+        "probe_ms": {k: round(v, 2) for k, v in timings.items()},
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
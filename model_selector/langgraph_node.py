@@ -1,18 +1,36 @@
 from typing import Dict, Any
 from agent_state import AgentState
 
+from model_selector.data_loader import classification_from_schema
 from model_selector.pipeline import run_model_selection
 
 
 def model_selector_node(state: AgentState) -> Dict[str, Any]:
     """
     LangGraph node wrapper for model selection pipeline.
+
+    Joins the in-memory results of the previous nodes; without them
+    (node run on its own) the data/ logs are read instead.
     """
 
     last_n = state.get("preprocess_last_n", 1)
 
-    results = run_model_selection(last_n)
+    preprocess = state.get("preprocess_1_result")
+    inspection = state.get("column_inspection")
+    schema = state.get("schema_result")
+
+    in_memory = preprocess is not None and inspection and schema
+
+    if in_memory:
+        results = run_model_selection(
+            last_n,
+            preprocess_records=[r["record"] for r in preprocess if "record" in r], #type: ignore
+            inspections=[inspection],
+            classifications=[classification_from_schema(schema)]
+        )
+    else:
+        results = run_model_selection(last_n)
 
     return {
         "model_selection_result": results
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+# --------------------------------------------------
+# LLM response cache
+# --------------------------------------------------
+# Validated model-selection answers keyed by the canonical JSON of
+# (summary, model, temperature, prompt). An unchanged dataset summary
+# is answered from disk instead of the network.
+CACHE_PATH = Path("data/llm_cache.sqlite")
+
+# least recently used entries beyond this are evicted
+MAX_ENTRIES = 10_000
+
+# entries older than this are treated as misses and evicted
+MAX_AGE_S = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    response    TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+"""
+
+# per-process hit / miss counters
+_stats = {"hits": 0, "misses": 0}
+
+
+def cache_key(summary, model, temperature, prompt):
+    canonical = json.dumps(
+        {"summary": summary, "model": model, "temperature": temperature, "prompt": prompt},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _connect(cache_path):
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(cache_path, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def get_cached(key, cache_path=CACHE_PATH, max_age_s=MAX_AGE_S):
+    """
+    Cached response (dict) or None; counts a hit or a miss.
+    """
+
+    now = time.time()
+    conn = _connect(cache_path)
+
+    try:
+        row = conn.execute(
+            "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row and now - row[1] <= max_age_s:
+            with conn:
+                conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+            _stats["hits"] += 1
+            return json.loads(row[0])
+
+    finally:
+        conn.close()
+
+    _stats["misses"] += 1
+    return None
+
+
+def put_cached(key, model, response, cache_path=CACHE_PATH,
+               max_entries=MAX_ENTRIES, max_age_s=MAX_AGE_S):
+    """
+    Stores a response, then evicts expired and least recently used entries.
+    """
+
+    now = time.time()
+    conn = _connect(cache_path)
+
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(response), now, now),
+            )
+            conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - max_age_s,))
+            conn.execute(
+                "DELETE FROM llm_responses WHERE key NOT IN "
+                "(SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT ?)",
+                (max_entries,),
+            )
+    finally:
+        conn.close()
+
+
+def cache_stats(cache_path=CACHE_PATH):
+    """
+    Hits, misses and hit rate of this process; entries on disk.
+    """
+
+    lookups = _stats["hits"] + _stats["misses"]
+    entries = 0
+
+    if Path(cache_path).exists():
+        conn = _connect(cache_path)
+        try:
+            entries = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        finally:
+            conn.close()
+
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        "entries": entries,
+    }
+
+
+def clear_llm_cache(cache_path=CACHE_PATH):
+    _stats.update(hits=0, misses=0)
+    if Path(cache_path).exists():
+        os.remove(cache_path)
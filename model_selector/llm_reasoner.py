@@ -2,8 +2,26 @@ from groq import Groq
 import json
 import api_keys
 
+from .llm_cache import cache_key, get_cached, put_cached
+
 MODEL = "llama-3.3-70b-versatile"
 
+TEMPERATURE = 0.1
+
+# deterministic mode: temperature 0, so a cached answer is the answer
+DETERMINISTIC = True
+
+# batched selection: keep each request well inside the model's limits
+MAX_BATCH_PROMPT_TOKENS = 8_000
+MAX_BATCH_COMPLETION_TOKENS = 8_000
+COMPLETION_TOKENS_PER_DATASET = 500
+
+# rough token estimate for JSON-heavy English prompts
+CHARS_PER_TOKEN = 4
+
+# per-process network round trips (all requests / batched ones)
+_calls = {"requests": 0, "batches": 0}
+
 
 def _client():
     return Groq()
@@ -28,6 +46,58 @@ model_dependent_preprocessing
 """
 
 
+def build_batch_prompt(keyed_summaries):
+    return f"""
+You are an expert ML system designer.
+
+Select appropriate model families for EACH dataset below.
+
+DATASET SUMMARIES (keyed):
+{json.dumps(keyed_summaries, indent=2)}
+
+Return STRICT JSON: one object whose keys are exactly the dataset keys
+above; each value has:
+
+problem_type
+problem_confidence (0-1)
+recommended_models (ordered best first)
+reasoning
+model_dependent_preprocessing
+"""
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def pack_batches(keyed_summaries):
+    """
+    Greedy packing of (key, summary) pairs under the prompt and
+    completion token limits.
+    """
+
+    base = estimate_tokens(build_batch_prompt({}))
+    max_size = max(1, MAX_BATCH_COMPLETION_TOKENS // COMPLETION_TOKENS_PER_DATASET)
+
+    batches = []
+    batch, tokens = [], base
+
+    for key, summary in keyed_summaries:
+        cost = estimate_tokens(json.dumps({key: summary}, indent=2))
+
+        if batch and (tokens + cost > MAX_BATCH_PROMPT_TOKENS or len(batch) >= max_size):
+            batches.append(batch)
+            batch, tokens = [], base
+
+        batch.append((key, summary))
+        tokens += cost
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
 def validate_llm_output(result):
 
     required = ["problem_type", "recommended_models"]
@@ -37,21 +107,114 @@ def validate_llm_output(result):
             raise ValueError(f"LLM missing field: {r}")
 
     result.setdefault("problem_confidence", 0.5)
-    result.setdefault("model_dependent_preprocessing", [])
+    result.setdefault("model_dependent_preprocessing", {})
 
     return result
 
 
-def llm_model_selection(dataset_summary):
+def llm_call_stats():
+    return dict(_calls)
+
+
+def _chat_json(prompt, max_tokens=None, temperature=TEMPERATURE):
 
     client = _client()
+    _calls["requests"] += 1
 
     completion = client.chat.completions.create(
         model=MODEL,
-        temperature=0.1,
-        messages=[{"role": "user", "content": build_prompt(dataset_summary)}],
-        response_format={"type": "json_object"}
+        temperature=temperature,
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"},
+        max_tokens=max_tokens
     )
 
-    result = json.loads(completion.choices[0].message.content) #type: ignore
-    return validate_llm_output(result)
\ No newline at end of file
+    return json.loads(completion.choices[0].message.content) #type: ignore
+
+
+def _temperature(deterministic):
+    return 0.0 if deterministic else TEMPERATURE
+
+
+def _cache_key(summary, temperature):
+    # the prompt template is part of the key: editing it invalidates answers
+    return cache_key(summary, MODEL, temperature, build_prompt({}))
+
+
+def _ask_single(dataset_summary, temperature, use_cache):
+    # one round trip, no cache lookup (the caller already missed)
+    result = validate_llm_output(
+        _chat_json(build_prompt(dataset_summary), temperature=temperature)
+    )
+
+    if use_cache:
+        put_cached(_cache_key(dataset_summary, temperature), MODEL, result)
+
+    return result
+
+
+def llm_model_selection(dataset_summary, deterministic=DETERMINISTIC, use_cache=True):
+
+    temperature = _temperature(deterministic)
+
+    if use_cache:
+        cached = get_cached(_cache_key(dataset_summary, temperature))
+        if cached is not None:
+            return cached
+
+    return _ask_single(dataset_summary, temperature, use_cache)
+
+
+def llm_model_selection_batch(summaries, deterministic=DETERMINISTIC, use_cache=True):
+    """
+    Several dataset summaries per round trip, answered as one keyed JSON
+    object. Cached summaries are answered from the cache; entries missing
+    from the response or failing validation fall back to a single
+    llm_model_selection call.
+
+    Returns one result per summary, in input order.
+    """
+
+    temperature = _temperature(deterministic)
+    results = [None] * len(summaries)
+    keyed = []
+
+    for i, s in enumerate(summaries):
+        cached = get_cached(_cache_key(s, temperature)) if use_cache else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            keyed.append((f"dataset_{i}", s))
+
+    index = {key: int(key.rsplit("_", 1)[1]) for key, _ in keyed}
+
+    for batch in pack_batches(keyed):
+
+        _calls["batches"] += 1
+
+        try:
+            response = _chat_json(
+                build_batch_prompt(dict(batch)),
+                max_tokens=COMPLETION_TOKENS_PER_DATASET * len(batch),
+                temperature=temperature
+            )
+        except Exception as e:
+            print(f"[LLM WARNING] batch of {len(batch)} failed: {e}")
+            response = {}
+
+        for key, summary in batch:
+            try:
+                entry = response.get(key)
+                if not isinstance(entry, dict):
+                    raise ValueError(f"LLM missing entry: {key}")
+                results[index[key]] = validate_llm_output(entry)
+
+                if use_cache:
+                    put_cached(_cache_key(summary, temperature), MODEL, results[index[key]])
+
+            except (ValueError, AttributeError) as e:
+                # AttributeError: the response was valid JSON but not an object
+                print(f"[LLM WARNING] {summary.get('dataset_name')}: {e}, single call")
+                results[index[key]] = _ask_single(summary, temperature, use_cache)
+
+    return results
\ No newline at end of file
@@ -1,10 +1,52 @@
-import json
+from datetime import datetime
 from pathlib import Path
 
+from audit_sink import append_jsonl
+
 OUTPUT_PATH = Path("data/model_selection.jsonl")
+RUN_SUMMARY_PATH = Path("data/model_selection_runs.jsonl")
 
 
 def append_record(record):
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record) + "\n")
\ No newline at end of file
+    append_jsonl(OUTPUT_PATH, record)
+
+
+def run_summary(plans, calls=None, cache=None):
+    """
+    LLM round trips made vs. skipped (confidence gate, warm start), and
+    total warm-start lookup time.
+
+    calls : llm_call_stats() counts made during the run
+    cache : LLM cache hits / misses during the run
+    """
+
+    calls = calls or {}
+    cache = cache or {}
+
+    meta = [p.get("meta_store") for p in plans]
+    gated = sum(1 for p in plans if (p.get("llm_gate") or {}).get("skipped"))
+    warm = sum(1 for m in meta if m and m["llm_call_skipped"])
+    saved = gated + warm
+
+    hits = cache.get("hits", 0)
+    lookups = hits + cache.get("misses", 0)
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "datasets": len(plans),
+        "llm_calls": calls.get("requests", 0),
+        "llm_batch_calls": calls.get("batches", 0),
+        "llm_calls_saved": saved,
+        "llm_calls_gated": gated,
+        "llm_calls_warm_started": warm,
+        "llm_skip_share": round(saved / len(plans), 4) if plans else 0.0,
+        "lookup_ms_total": round(sum(m["lookup_ms"] for m in meta if m), 3),
+        "llm_cache": {
+            **cache,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        },
+    }
+
+
+def append_run_summary(summary):
+    append_jsonl(RUN_SUMMARY_PATH, summary)
@@ -0,0 +1,184 @@
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from artifact_store import iter_jsonl_reverse
+
+from .logger import OUTPUT_PATH
+
+# --------------------------------------------------
+# META-FEATURE STORE
+# --------------------------------------------------
+# Past model_selection.jsonl records indexed by their data characteristics.
+# A new dataset close enough to a past one reuses its ranking instead of
+# asking the LLM again.
+
+# max Euclidean distance in meta-feature space for a warm start
+WARM_START_DISTANCE = 0.1
+
+META_FEATURES = [
+    "log_rows",
+    "log_features",
+    "numeric_share",
+    "categorical_share",
+    "text_share",
+    "correlation_density",
+    "missing_ratio",
+    "dimensionality_ratio",
+]
+
+WARM_START_SOURCE = "meta_store"
+
+# rule-only rankings recorded when the confidence gate skipped the LLM
+GATE_SOURCE = "confidence_gate"
+
+
+def meta_features(char):
+    """
+    Characteristics -> vector with every component roughly in [0, 1].
+    """
+
+    counts = char.get("feature_type_counts", {})
+    total = max(1, sum(counts.values()))
+
+    return np.array([
+        math.log10(1 + char.get("n_rows", 0)) / 7,
+        math.log10(1 + char.get("n_features", 0)) / 4,
+        counts.get("numeric", 0) / total,
+        counts.get("categorical", 0) / total,
+        counts.get("text", 0) / total,
+        char.get("correlation_density", 0) or 0,
+        char.get("missing_ratio", 0) or 0,
+        min(1.0, char.get("dimensionality_ratio", 0) or 0),
+    ], dtype=np.float64)
+
+
+def _usable(rec):
+    """
+    Only rankings backed by an actual LLM answer or a race; warm-started
+    records are skipped so reuse does not chain, gated ones because no
+    LLM answered.
+    """
+
+    llm = rec.get("llm_analysis") or {}
+    ranked = (rec.get("model_selection") or {}).get("ranked_models")
+
+    return (
+        bool(ranked)
+        and rec.get("data_characteristics")
+        and llm.get("source") not in (WARM_START_SOURCE, GATE_SOURCE)
+    )
+
+
+class MetaStore:
+    """
+    Nearest-neighbour index over past model selections, rebuilt only when
+    the log file changes.
+    """
+
+    def __init__(self, log_path=OUTPUT_PATH):
+        self.log_path = Path(log_path)
+        self._stamp = None
+        self.records = []
+        self.problem_types = np.array([], dtype=object)
+        self.matrix = np.empty((0, len(META_FEATURES)))
+
+    def _refresh(self):
+
+        try:
+            st = self.log_path.stat()
+            stamp = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stamp = None
+
+        if stamp == self._stamp:
+            return
+
+        records = []
+        seen = set()
+
+        # newest first: the latest selection per dataset content wins
+        for rec in iter_jsonl_reverse(self.log_path):
+            if not _usable(rec):
+                continue
+
+            key = (rec.get("dataset") or {}).get("raw_hash") or rec.get("experiment_id")
+            if key in seen:
+                continue
+
+            seen.add(key)
+            records.append(rec)
+
+        self.records = records
+        self.problem_types = np.array(
+            [r["problem_definition"]["canonical_type"] for r in records], dtype=object
+        )
+        self.matrix = (
+            np.vstack([meta_features(r["data_characteristics"]) for r in records])
+            if records else np.empty((0, len(META_FEATURES)))
+        )
+        self._stamp = stamp
+
+    def nearest(self, char, problem_type):
+        """
+        Closest past selection with the same problem type.
+        Returns (record, distance) or (None, None).
+        """
+
+        self._refresh()
+
+        mask = self.problem_types == problem_type
+        if not mask.any():
+            return None, None
+
+        candidates = np.flatnonzero(mask)
+        dist = np.linalg.norm(self.matrix[candidates] - meta_features(char), axis=1)
+        best = int(np.argmin(dist))
+
+        return self.records[candidates[best]], float(dist[best])
+
+
+_store = MetaStore()
+
+
+def warm_start(char, problem_type, max_distance=WARM_START_DISTANCE, store=None):
+    """
+    LLM-shaped result from the nearest past selection, or None.
+
+    Returns (llm_result | None, info) where info reports the neighbour,
+    its distance and the lookup time.
+    """
+
+    store = store or _store
+
+    t = time.perf_counter()
+    rec, dist = store.nearest(char, problem_type)
+    lookup_ms = round((time.perf_counter() - t) * 1000, 3)
+
+    hit = rec is not None and dist <= max_distance
+
+    info = {
+        "neighbor_experiment_id": rec.get("experiment_id") if rec else None,
+        "neighbor_dataset": (rec.get("dataset") or {}).get("name") if rec else None,
+        "distance": dist,
+        "max_distance": max_distance,
+        "lookup_ms": lookup_ms,
+        "llm_call_skipped": hit,
+    }
+
+    if not hit:
+        return None, info
+
+    problem = rec["problem_definition"]
+
+    llm_result = {
+        **rec.get("llm_analysis", {}),
+        "problem_type": problem["canonical_type"],
+        "problem_confidence": problem.get("llm_confidence", 0.5),
+        "recommended_models": [m["model"] for m in rec["model_selection"]["ranked_models"]],
+        "source": WARM_START_SOURCE,
+    }
+
+    return llm_result, info
@@ -91,6 +91,8 @@
 
 import re
 
+from .cost_model import estimate_cost, within_budget, BUDGET_MODES
+
 MODEL_REGISTRY = {
     "random_forest": dict(classification=True, regression=True, clustering=False, nonlinear=True),
     "xgboost": dict(classification=True, regression=True, clustering=False, nonlinear=True),
@@ -142,7 +144,12 @@ def canonical_model_name(name: str):
     if not name:
         return None
 
-    name = name.lower()
+    name = name.lower().strip()
+
+    # already canonical? (checked before punctuation removal drops "_")
+    if name in MODEL_REGISTRY:
+        return name
+
     name = re.sub(r"[^a-z0-9 ]+", "", name)  # remove punctuation
     name = name.strip()
 
@@ -181,6 +188,13 @@ FUSION_WEIGHTS = {
     "llm": 0.4
 }
 
+# used when a subsample race measured the candidates
+RACE_FUSION_WEIGHTS = {
+    "data": 0.2,
+    "llm": 0.2,
+    "race": 0.6
+}
+
 
 def allowed_models(problem_type):
 
@@ -203,6 +217,35 @@ def allowed_models(problem_type):
     return out
 
 
+# probe score gap treated as a real difference
+LANDMARK_MARGIN = 0.02
+
+NONLINEAR_PROBES = ("decision_stump", "nearest_neighbor")
+
+
+def landmark_score(model, landmarks):
+    """
+    Nonlinear models gain when the stump / 1-NN probes beat the linear
+    probe; linear models gain when the linear probe is competitive.
+    """
+
+    scores = (landmarks or {}).get("scores", {})
+
+    if "linear" not in scores:
+        return 0
+
+    nonlinear = [scores[p] for p in NONLINEAR_PROBES if p in scores]
+    if not nonlinear:
+        return 0
+
+    gap = max(nonlinear) - scores["linear"]
+
+    if MODEL_REGISTRY[model]["nonlinear"]:
+        return 1 if gap > LANDMARK_MARGIN else 0
+
+    return 1 if gap <= LANDMARK_MARGIN else 0
+
+
 def data_score(model, char):
 
     s = 0
@@ -216,6 +259,8 @@ def data_score(model, char):
     if char["missing_ratio"] > 0.1:
         s += 0.5
 
+    s += landmark_score(model, char.get("landmarks"))
+
     return s
 
 
@@ -227,11 +272,40 @@ def llm_score(model, normalized_llm_ranked):
     return 1 - (normalized_llm_ranked.index(model) / len(normalized_llm_ranked))
 
 
+def race_score(model, race):
+    """
+    1 for the race winner down to 0 for the first model eliminated.
+    None for models that were not raced (no local implementation, or
+    the fit failed): rank_models scores them with FUSION_WEIGHTS.
+    """
+
+    order = race["order"]
+
+    if model not in order:
+        return None
+
+    if len(order) == 1:
+        return 1.0
+
+    return 1 - order.index(model) / (len(order) - 1)
+
+
 # --------------------------------------------------
 # FINAL RANK
 # --------------------------------------------------
 
-def rank_models(problem_type, characteristics, llm_result):
+def rank_models(problem_type, characteristics, llm_result, race=None, budget=None):
+    """
+    race: racing.race_models() output; when given, measured validation
+    results dominate the heuristic and LLM scores.
+
+    budget: {"max_train_s", "max_memory_mb", "cores", "mode"}; candidates
+    whose estimated cost exceeds it rank after every candidate within it
+    (mode "penalize", default) or are left out (mode "exclude").
+    """
+
+    if budget and budget.get("mode", "penalize") not in BUDGET_MODES:
+        raise ValueError(f"Unknown budget mode: {budget['mode']}")
 
     allowed = allowed_models(problem_type)
 
@@ -245,18 +319,42 @@ def rank_models(problem_type, characteristics, llm_result):
         d = data_score(m, characteristics)
         l = llm_score(m, llm_ranked)
 
-        final = FUSION_WEIGHTS["data"] * d + FUSION_WEIGHTS["llm"] * l
+        r = race_score(m, race) if race else None
+
+        # unraced models fall back to the non-race weighting
+        weights = RACE_FUSION_WEIGHTS if r is not None else FUSION_WEIGHTS
+
+        final = weights["data"] * d + weights["llm"] * l
+
+        scores = {
+            "data_fit": d,
+            "llm_support": l
+        }
+
+        if race:
+            if r is not None:
+                final += weights["race"] * r
+            scores["race_support"] = r
+            scores["race_validation"] = race["scores"].get(m)
+
+        within = True
+
+        if budget:
+            cost = estimate_cost(m, characteristics, problem_type, budget.get("cores"))
+            within = within_budget(cost, budget)
+            scores["estimated_cost"] = cost
+
+            if not within and budget.get("mode") == "exclude":
+                continue
 
         scored.append({
             "model": m,
-            "scores": {
-                "data_fit": d,
-                "llm_support": l
-            },
-            "final_score": final
+            "scores": scores,
+            "final_score": final,
+            "within_budget": within
         })
 
-    scored.sort(key=lambda x: x["final_score"], reverse=True)
+    scored.sort(key=lambda x: (x["within_budget"], x["final_score"]), reverse=True)
 
     for i, m in enumerate(scored):
         m["rank"] = i + 1
@@ -1,16 +1,86 @@
 from .data_loader import load_datasets
-from .selector import build_model_plan
-from .logger import append_record
+from .selector import (
+    build_model_plan, prepare_model_plan, finish_model_plan, build_llm_summary, LLM_GATE
+)
+from .llm_reasoner import llm_model_selection_batch, llm_call_stats
+from .llm_cache import cache_stats
+from .logger import append_record, append_run_summary, run_summary
 
 
-def run_model_selection(last_n):
+def _run_batched(datasets, race_budget_s, landmarks, warm_start, llm_gate, budget):
+    """
+    Gate and warm start for every dataset first, then one batched LLM
+    round trip for those still needing an answer.
+    """
 
-    datasets = load_datasets(last_n)
+    states = [
+        prepare_model_plan(ds, landmarks, warm_start, llm_gate, budget)
+        for ds in datasets
+    ]
+
+    pending = [i for i, st in enumerate(states) if st["llm_result"] is None]
+    answers = llm_model_selection_batch([build_llm_summary(datasets[i]) for i in pending])
+
+    for i, answer in zip(pending, answers):
+        states[i]["llm_result"] = answer
+
+    return [
+        finish_model_plan(ds, st, race_budget_s, landmarks, budget)
+        for ds, st in zip(datasets, states)
+    ]
+
+
+def run_model_selection(last_n, race_budget_s=None, landmarks=True, warm_start=True, llm_gate=LLM_GATE,
+                        budget=None, batch_llm=False,
+                        preprocess_records=None, inspections=None, classifications=None):
+
+    datasets = load_datasets(last_n, preprocess_records, inspections, classifications)
     results = []
 
-    for ds in datasets:
-        plan = build_model_plan(ds)
-        append_record(plan)
-        results.append(plan)
+    # process-wide counters: the run reports its own deltas
+    calls_before = llm_call_stats()
+    cache_before = cache_stats()
+
+    if batch_llm:
+        for plan in _run_batched(datasets, race_budget_s, landmarks, warm_start, llm_gate, budget):
+            append_record(plan)
+            results.append(plan)
+
+    else:
+        for ds in datasets:
+            plan = build_model_plan(
+                ds, race_budget_s=race_budget_s, landmarks=landmarks,
+                warm_start=warm_start, llm_gate=llm_gate, budget=budget
+            )
+            append_record(plan)
+            results.append(plan)
+
+    calls_after = llm_call_stats()
+    cache_after = cache_stats()
+
+    summary = run_summary(
+        results,
+        calls={k: calls_after[k] - calls_before[k] for k in calls_after},
+        cache={
+            "hits": cache_after["hits"] - cache_before["hits"],
+            "misses": cache_after["misses"] - cache_before["misses"],
+            "entries": cache_after["entries"],
+        },
+    )
+    append_run_summary(summary)
+
+    cache = summary["llm_cache"]
+
+    print(
+        f"[MODEL SELECTION] {summary['datasets']} datasets, "
+        f"{summary['llm_calls']} LLM round trips ({summary['llm_batch_calls']} batched), "
+        f"{summary['llm_calls_saved']} datasets skipped the LLM "
+        f"({summary['llm_calls_gated']} gated, {summary['llm_calls_warm_started']} warm start, "
+        f"{summary['llm_skip_share']:.0%}; {summary['lookup_ms_total']} ms lookup)"
+    )
+    print(
+        f"[MODEL SELECTION] LLM cache: {cache['hits']} hits, {cache['misses']} misses "
+        f"({cache['hit_rate']:.0%} hit rate, {cache['entries']} entries)"
+    )
 
-    return results
\ No newline at end of file
+    return results
@@ -1,7 +1,47 @@
 from typing import Optional, List, Dict
 
 
-def detect_problem_type(target_column: Optional[str], column_profiles: List[Dict]):
+# integer / discrete targets with at most this many distinct values are classes
+MAX_CLASSES = 20
+
+LABEL_TECHNICAL_TYPES = ("str", "string", "object", "category", "bool")
+
+
+def _n_unique(profile: Dict, n_rows: Optional[int]):
+
+    ratio = profile.get("unique_ratio")
+
+    if ratio is None or not n_rows:
+        return None
+
+    return round(ratio * n_rows)
+
+
+def _by_cardinality(profile: Dict, n_rows: Optional[int]):
+    """
+    Targets profiled as "target", "numeric_discrete" or with an integer
+    dtype: decided by technical type and number of distinct values.
+    """
+
+    technical = str(profile.get("technical_type") or "").lower()
+    n_unique = _n_unique(profile, n_rows)
+    level = profile.get("cardinality_level")
+
+    if technical in LABEL_TECHNICAL_TYPES:
+        return "classification", 0.9
+
+    few = n_unique <= MAX_CLASSES if n_unique is not None else level == "low"
+
+    if technical.startswith(("int", "uint")) or profile.get("semantic_type") == "numeric_discrete":
+        return ("classification", 0.9) if few else ("regression", 0.8)
+
+    if technical.startswith("float"):
+        return ("classification", 0.7) if few else ("regression", 0.9)
+
+    return None
+
+
+def detect_problem_type(target_column: Optional[str], column_profiles: List[Dict], n_rows: Optional[int] = None):
 
     if target_column is None:
         return "unsupervised", 1.0
@@ -17,6 +57,10 @@ def detect_problem_type(target_column: Optional[str], column_profiles: List[Dict
             if semantic == "numeric_continuous":
                 return "regression", 0.95
 
+            decided = _by_cardinality(c, n_rows)
+            if decided:
+                return decided
+
     return "unknown", 0.3
 
 
@@ -28,4 +72,4 @@ def detect_semi_supervised(dataset):
     if dataset.get("target_missing_ratio", 0) > 0.4:
         return True, 0.9
 
-    return False, 0.0
\ No newline at end of file
+    return False, 0.0
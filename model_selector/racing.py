@@ -0,0 +1,293 @@
+import math
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.metrics import f1_score, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+
+from preprocess_1.design_matrix import build_design_matrix, load_design_matrix
+
+try:
+    from xgboost import XGBClassifier, XGBRegressor
+except ImportError:
+    XGBClassifier = XGBRegressor = None
+
+try:
+    from lightgbm import LGBMClassifier, LGBMRegressor
+except ImportError:
+    LGBMClassifier = LGBMRegressor = None
+
+
+# --------------------------------------------------
+# RACE SETTINGS
+# --------------------------------------------------
+
+DEFAULT_BUDGET_S = 60.0
+
+# successive halving: keep 1/ETA of the field, grow the sample ETA x
+ETA = 3
+MIN_RUNG_ROWS = 500
+
+MIN_LABELLED_ROWS = 50
+
+VALIDATION_FRACTION = 0.2
+MAX_VALIDATION_ROWS = 20_000
+
+RACE_METRICS = {
+    "classification": "f1_macro",
+    "regression": "r2",
+}
+
+RANDOM_STATE = 42
+
+
+# --------------------------------------------------
+# LOCAL IMPLEMENTATIONS (registry name -> estimator)
+# --------------------------------------------------
+
+def _estimator(model, problem_type):
+
+    classify = problem_type == "classification"
+
+    if model == "random_forest":
+        est = (RandomForestClassifier if classify else RandomForestRegressor)(
+            n_estimators=100, n_jobs=1, random_state=RANDOM_STATE
+        )
+
+    elif model == "logistic_regression" and classify:
+        est = LogisticRegression(max_iter=1000)
+
+    elif model == "linear_regression" and not classify:
+        est = LinearRegression()
+
+    elif model == "xgboost" and XGBClassifier is not None:
+        est = (XGBClassifier if classify else XGBRegressor)(
+            n_estimators=200, n_jobs=1, random_state=RANDOM_STATE
+        )
+
+    elif model == "lightgbm" and LGBMClassifier is not None:
+        est = (LGBMClassifier if classify else LGBMRegressor)(
+            n_estimators=200, n_jobs=1, random_state=RANDOM_STATE, verbose=-1
+        )
+
+    else:
+        return None
+
+    # preprocessed matrices can still hold NaN in columns never imputed
+    return make_pipeline(SimpleImputer(strategy="median", keep_empty_features=True), est)
+
+
+def raceable_models(models, problem_type):
+    """
+    Candidates with a local implementation for this problem type.
+    """
+
+    if problem_type not in RACE_METRICS:
+        return []
+
+    return [m for m in models if _estimator(m, problem_type) is not None]
+
+
+# --------------------------------------------------
+# WORKER (runs in a pool process)
+# --------------------------------------------------
+
+def _score(problem_type, y_true, y_pred):
+    if problem_type == "classification":
+        return float(f1_score(y_true, y_pred, average="macro"))
+    return float(r2_score(y_true, y_pred))
+
+
+def _fit_score(model, problem_type, matrix_path, train_idx, val_idx):
+    """
+    Fits one candidate on train_idx and scores it on val_idx. The design
+    matrix is memory-mapped, so workers share one copy of the data.
+    """
+
+    X, y, _ = load_design_matrix(matrix_path)
+
+    est = _estimator(model, problem_type)
+    est.fit(X[train_idx], y[train_idx])
+
+    return _score(problem_type, y[val_idx], est.predict(X[val_idx]))
+
+
+# --------------------------------------------------
+# SAMPLING
+# --------------------------------------------------
+
+def _stratify(y, problem_type):
+    if problem_type != "classification":
+        return None
+    _, counts = np.unique(y, return_counts=True)
+    return y if counts.min() >= 2 else None
+
+
+def labelled_rows(y, target_info):
+    """
+    Row indices with a known label (NaN targets, coded-missing classes out).
+    """
+
+    if target_info["dtype"] == "float32":
+        return np.flatnonzero(~np.isnan(y))
+    if target_info["classes"]:
+        return np.flatnonzero(y >= 0)
+    return np.arange(len(y))
+
+
+def _subsample(idx, y, size, problem_type, seed):
+    if size >= len(idx):
+        return idx
+    sub, _ = train_test_split(
+        idx, train_size=size, random_state=seed,
+        stratify=_stratify(y[idx], problem_type)
+    )
+    return np.sort(sub)
+
+
+def _rung_sizes(n_train, n_candidates):
+    """
+    Sample size per rung: the last rung uses every training row.
+    """
+
+    n_rungs = max(1, math.ceil(math.log(max(n_candidates, 1), ETA)) + 1)
+    sizes = [n_train // (ETA ** (n_rungs - 1 - k)) for k in range(n_rungs)]
+    return sorted({min(n_train, max(MIN_RUNG_ROWS, s)) for s in sizes})
+
+
+def _race_order(rungs, models):
+    """
+    Deeper rung first, then the score reached there.
+    """
+
+    best = {}
+    for depth, rung in enumerate(rungs):
+        for m, s in rung["scores"].items():
+            best[m] = (depth, s)
+
+    return sorted(
+        (m for m in models if m in best),
+        key=lambda m: best[m],
+        reverse=True
+    )
+
+
+# --------------------------------------------------
+# RACE
+# --------------------------------------------------
+
+def race_models(dataset, models, problem_type, budget_s=DEFAULT_BUDGET_S, workers=None):
+    """
+    Successive halving of the local candidates on growing stratified
+    subsamples of the preprocessed artifact, within a wall-clock budget.
+
+    Returns None when nothing can be raced or no fit finished within the
+    budget, otherwise:
+        metric, n_train, n_validation, rungs [{n_rows, scores}],
+        scores (score at the deepest rung per model), order (best first),
+        elapsed_s, budget_s, timed_out
+    """
+
+    candidates = raceable_models(models, problem_type)
+    record = dataset.get("preprocess_record")
+
+    if not candidates or record is None:
+        return None
+
+    start = time.perf_counter()
+    deadline = start + budget_s
+
+    manifest = build_design_matrix({
+        **record,
+        "target": record.get("target") or dataset.get("target_column")
+    })
+    _, y, _ = load_design_matrix(manifest["path"])
+
+    if y is None:
+        return None
+
+    labelled = labelled_rows(y, manifest["y"])
+
+    if len(labelled) < MIN_LABELLED_ROWS:
+        return None
+
+    n_val = min(MAX_VALIDATION_ROWS, int(len(labelled) * VALIDATION_FRACTION))
+    train_idx, val_idx = train_test_split(
+        labelled, test_size=n_val, random_state=RANDOM_STATE,
+        stratify=_stratify(y[labelled], problem_type)
+    )
+    val_idx = np.sort(val_idx)
+
+    rungs = []
+    alive = list(candidates)
+    timed_out = False
+
+    # multiprocessing.Pool: terminate() stops fits that are still running
+    pool = Pool(processes=workers or min(len(candidates), os.cpu_count() or 1))
+
+    try:
+        for k, size in enumerate(_rung_sizes(len(train_idx), len(candidates))):
+
+            sub = _subsample(train_idx, y, size, problem_type, RANDOM_STATE + k)
+
+            jobs = {
+                m: pool.apply_async(_fit_score, (m, problem_type, manifest["path"], sub, val_idx))
+                for m in alive
+            }
+
+            scores = {}
+
+            # fits finished by the deadline count, the rest are abandoned
+            for m, job in jobs.items():
+                job.wait(max(0.0, deadline - time.perf_counter()))
+
+                if not job.ready():
+                    timed_out = True
+                    continue
+
+                try:
+                    scores[m] = job.get()
+                except Exception as e:
+                    print(f"[RACE WARNING] {m}: {e}")
+
+            if scores:
+                rungs.append({"n_rows": int(len(sub)), "scores": scores})
+
+            # keep the best 1/ETA of this rung
+            keep = max(1, math.ceil(len(scores) / ETA))
+            alive = sorted(scores, key=scores.get, reverse=True)[:keep]
+
+            if timed_out or len(alive) <= 1:
+                break
+
+    finally:
+        if timed_out:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+
+    if not rungs:
+        print(f"[RACE WARNING] no candidate finished within {budget_s}s")
+        return None
+
+    order = _race_order(rungs, candidates)
+
+    return {
+        "metric": RACE_METRICS[problem_type],
+        "design_matrix": manifest["path"],
+        "n_train": int(len(train_idx)),
+        "n_validation": int(len(val_idx)),
+        "rungs": rungs,
+        "scores": {m: s for rung in rungs for m, s in rung["scores"].items()},
+        "order": order,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+        "budget_s": budget_s,
+        "timed_out": timed_out
+    }
@@ -131,8 +131,11 @@
 
 from .problem_type_detector import detect_problem_type, detect_semi_supervised
 from .data_characteristics import compute_characteristics
-from .model_rules import rank_models, FUSION_WEIGHTS
+from .model_rules import rank_models, allowed_models, FUSION_WEIGHTS, RACE_FUSION_WEIGHTS
 from .llm_reasoner import llm_model_selection
+from .racing import race_models
+from .landmarking import compute_landmarks
+from .meta_store import warm_start as meta_warm_start, GATE_SOURCE
 from .utils import file_sha256, now_iso, new_experiment_id, SELECTOR_VERSION
 
 
@@ -286,11 +289,79 @@ def reconcile_preprocessing(llm_result, preprocessing):
     }
 
 
+# =====================================================
+# LLM CONFIDENCE GATE
+# =====================================================
+
+TOP_K = 3
+
+# above both thresholds the rule-based decision stands without the LLM
+LLM_GATE = {
+    "min_rule_confidence": 0.9,
+    "min_margin": 0.3
+}
+
+
+def ranking_margin(ranking, k=TOP_K):
+    """
+    Smallest of the gap between the first two models (the primary must
+    lead) and the gap at the top-k boundary (last kept vs. first dropped).
+    """
+
+    scores = [m["final_score"] for m in ranking]
+
+    if len(scores) < 2:
+        return float("inf")
+
+    margin = scores[0] - scores[1]
+
+    if len(scores) > k:
+        margin = min(margin, scores[k - 1] - scores[k])
+
+    return margin
+
+
+def confidence_gate(rule_type, rule_conf, semi_flag, char, gate=LLM_GATE, budget=None):
+    """
+    Decides whether the LLM call can be skipped: confident rule-based
+    problem type and a rule-only ranking that is already decisive.
+    """
+
+    info = {
+        "skipped": False,
+        "rule_confidence": rule_conf,
+        "margin": None,
+        **gate
+    }
+
+    if semi_flag or rule_type == "unknown" or rule_conf < gate["min_rule_confidence"]:
+        return info
+
+    margin = ranking_margin(rank_models(rule_type, char, {}, budget=budget))
+
+    info["margin"] = None if margin == float("inf") else round(margin, 4)
+    info["skipped"] = margin >= gate["min_margin"]
+
+    return info
+
+
+def _landmarks(dataset, problem_type):
+    try:
+        return compute_landmarks(dataset, problem_type)
+    except Exception as e:
+        print(f"[LANDMARK WARNING] {dataset['dataset_name']}: {e}")
+        return None
+
+
 # =====================================================
 # MAIN MODEL PLAN BUILDER
 # =====================================================
 
-def build_model_plan(dataset):
+def prepare_model_plan(dataset, landmarks=True, warm_start=True, llm_gate=LLM_GATE, budget=None):
+    """
+    Everything up to the LLM call. Returns the selection state; its
+    "llm_result" is already filled when the gate or a warm start answered.
+    """
 
     experiment_id = new_experiment_id()
     char = compute_characteristics(dataset)
@@ -298,14 +369,66 @@ def build_model_plan(dataset):
     # ---------------- rule inference ----------------
     rule_type, rule_conf = detect_problem_type(
         dataset["target_column"],
-        dataset["column_profiles"]
+        dataset["column_profiles"],
+        n_rows=dataset.get("n_rows")
     )
 
     # ---------------- semi supervised ----------------
     semi_flag, _ = detect_semi_supervised(dataset)
 
-    # ---------------- llm inference ----------------
-    llm_result = llm_model_selection(build_llm_summary(dataset))
+    # ---------------- confidence gate ----------------
+    char["landmarks"] = None
+    landmark_type = None
+    gate_info = None
+
+    if llm_gate:
+        if landmarks and not semi_flag and rule_conf >= llm_gate["min_rule_confidence"]:
+            char["landmarks"] = _landmarks(dataset, rule_type)
+            landmark_type = rule_type
+
+        gate_info = confidence_gate(rule_type, rule_conf, semi_flag, char, llm_gate, budget)
+
+    # ---------------- warm start ----------------
+    llm_result, meta_info = None, None
+
+    if gate_info and gate_info["skipped"]:
+        llm_result = {
+            "problem_type": rule_type,
+            "problem_confidence": rule_conf,
+            "recommended_models": [],
+            "source": GATE_SOURCE
+        }
+
+    elif warm_start and rule_type != "unknown":
+        llm_result, meta_info = meta_warm_start(char, rule_type)
+
+    return {
+        "experiment_id": experiment_id,
+        "char": char,
+        "rule_type": rule_type,
+        "rule_conf": rule_conf,
+        "semi_flag": semi_flag,
+        "landmark_type": landmark_type,
+        "gate_info": gate_info,
+        "meta_info": meta_info,
+        "llm_result": llm_result
+    }
+
+
+def finish_model_plan(dataset, state, race_budget_s=None, landmarks=True, budget=None):
+    """
+    Arbitration, ranking and the experiment manifest once
+    state["llm_result"] is known.
+    """
+
+    experiment_id = state["experiment_id"]
+    char = state["char"]
+    rule_type, rule_conf = state["rule_type"], state["rule_conf"]
+    semi_flag = state["semi_flag"]
+    landmark_type = state["landmark_type"]
+    gate_info, meta_info = state["gate_info"], state["meta_info"]
+    llm_result = state["llm_result"]
+
     llm_type = llm_result.get("problem_type", "unknown")
     llm_conf = llm_result.get("problem_confidence", 0.5)
 
@@ -328,11 +451,25 @@ def build_model_plan(dataset):
     # ---------------- METADATA ----------------
     problem_meta = get_problem_metadata(final_problem)
 
+    # ---------------- LANDMARKING ----------------
+    if landmarks and landmark_type != final_problem:
+        char["landmarks"] = _landmarks(dataset, final_problem)
+
+    # ---------------- SUBSAMPLE RACE (optional) ----------------
+    race = None
+    if race_budget_s:
+        race = race_models(
+            dataset,
+            allowed_models(final_problem),
+            final_problem,
+            budget_s=race_budget_s
+        )
+
     # ---------------- MODEL RANKING ----------------
-    ranking = rank_models(final_problem, char, llm_result)
+    ranking = rank_models(final_problem, char, llm_result, race=race, budget=budget)
 
     primary_model = ranking[0]["model"] if ranking else None
-    top_k = [m["model"] for m in ranking[:3]]
+    top_k = [m["model"] for m in ranking[:TOP_K]]
 
     preprocessing_recon = reconcile_preprocessing(
         llm_result,
@@ -380,8 +517,39 @@ def build_model_plan(dataset):
             "primary_model": primary_model,
             "top_k": top_k,
             "ranked_models": ranking,
-            "fusion_weights": FUSION_WEIGHTS
+            "fusion_weights": RACE_FUSION_WEIGHTS if race else FUSION_WEIGHTS,
+            "race": race,
+            "budget": budget
         },
 
-        "llm_analysis": llm_result
-    }
\ No newline at end of file
+        "llm_analysis": llm_result,
+        "meta_store": meta_info,
+        "llm_gate": gate_info
+    }
+
+
+def build_model_plan(dataset, race_budget_s=None, landmarks=True, warm_start=True, llm_gate=LLM_GATE,
+                     budget=None, llm_result=None):
+    """
+    race_budget_s: when set, the local candidates are raced on subsamples
+                   of the preprocessed data (successive halving) for at
+                   most this many seconds and the results feed the ranking.
+    landmarks    : fit cheap probes (stump, naive Bayes, 1-NN, linear) on
+                   a bounded subsample; scores go to data_characteristics.
+    warm_start   : reuse the ranking of the nearest past dataset (same
+                   problem type) instead of calling the LLM.
+    llm_gate     : thresholds above which the rule-based problem type and
+                   ranking are used without the LLM (None: always ask).
+    budget       : {"max_train_s", "max_memory_mb", "cores", "mode"};
+                   candidates whose estimated training cost exceeds it are
+                   ranked last ("penalize") or dropped ("exclude").
+    llm_result   : precomputed LLM answer (e.g. from a batched call), used
+                   when neither the gate nor a warm start answered.
+    """
+
+    state = prepare_model_plan(dataset, landmarks, warm_start, llm_gate, budget)
+
+    if state["llm_result"] is None:
+        state["llm_result"] = llm_result or llm_model_selection(build_llm_summary(dataset))
+
+    return finish_model_plan(dataset, state, race_budget_s, landmarks, budget)
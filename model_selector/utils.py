@@ -1,21 +1,14 @@
-import hashlib
 import uuid
 from datetime import datetime
-from pathlib import Path
+
+from fingerprint import file_fingerprint
 
 SELECTOR_VERSION = "2.0.0"
 
 
 def file_sha256(path: str):
-    p = Path(path)
-    if not p.exists():
-        return None
-
-    h = hashlib.sha256()
-    with open(p, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    # cached by (path, size, mtime_ns, inode): unchanged files are not re-read
+    return file_fingerprint(path)
 
 
 def now_iso():
@@ -0,0 +1,312 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from fingerprint import fast_fingerprint
+
+from .plan_schema import PreprocessPlan
+from .encoding import encoding_actions, transform_encodings
+from .writer import read_output, sample_output
+
+
+DESIGN_DIR = Path("data/design_matrices")
+
+# dense float32 up to this size, CSR beyond
+DENSE_MAX_BYTES = 1 << 30
+
+# rows converted per block while filling the matrix
+ROW_BLOCK = 65_536
+
+MANIFEST_NAME = "manifest.json"
+
+
+# -------------------------------------------------
+# layout
+# -------------------------------------------------
+def _numeric_columns(plan: PreprocessPlan, df):
+    """
+    Pass-through numeric features: not the target, not encoded.
+    """
+
+    encoded = set(encoding_actions(plan, df.columns))
+
+    return [
+        c for c in df.columns
+        if c != plan.target
+        and c not in encoded
+        and pd.api.types.is_numeric_dtype(df[c])
+    ]
+
+
+def _fit_scaling(plan: PreprocessPlan, df, numeric):
+    """
+    Standard scaling for columns the plan deferred to "scaling".
+    """
+
+    cols = [d.column for d in plan.deferred if d.strategy == "scaling" and d.column in numeric]
+    if not cols:
+        return {}
+
+    mean = df[cols].mean()
+    scale = df[cols].std(ddof=0).replace(0, 1).fillna(1)
+
+    return {
+        c: {"mean": float(mean[c]), "scale": float(scale[c])}
+        for c in cols
+        if not pd.isna(mean[c])
+    }
+
+
+def _target_vector(df, target):
+    """
+    Returns (y, {"dtype", "classes"}); labels are coded when not numeric.
+    """
+
+    if target is None or target not in df.columns:
+        return None, None
+
+    y = df[target]
+
+    if pd.api.types.is_float_dtype(y):
+        return np.ascontiguousarray(y.to_numpy(dtype=np.float32)), {"dtype": "float32", "classes": None}
+
+    if pd.api.types.is_integer_dtype(y) or pd.api.types.is_bool_dtype(y):
+        return np.ascontiguousarray(y.to_numpy(dtype=np.int64)), {"dtype": "int64", "classes": None}
+
+    codes, classes = pd.factorize(y, sort=True)
+    return codes.astype(np.int32), {"dtype": "int32", "classes": [str(c) for c in classes]}
+
+
+def _numeric_block(df, numeric, scaling):
+    block = df[numeric].to_numpy(dtype=np.float32, copy=True)
+
+    for j, c in enumerate(numeric):
+        if c in scaling:
+            block[:, j] -= np.float32(scaling[c]["mean"])
+            block[:, j] /= np.float32(scaling[c]["scale"])
+
+    return block
+
+
+# -------------------------------------------------
+# content key
+# -------------------------------------------------
+def _design_key(record, plan: PreprocessPlan):
+    """
+    Same preprocessed output + same encodings = same matrix.
+    """
+
+    source = record.get("content_key") or fast_fingerprint(record["output_file_path"])
+
+    spec = json.dumps(
+        {
+            "target": plan.target,
+            "deferred": [
+                {"column": d.column, "strategy": d.strategy, "params": d.params}
+                for d in plan.deferred
+            ],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+    return hashlib.sha256(f"{source}\0{spec}".encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------
+# writers
+# -------------------------------------------------
+def _write_dense(path, df, numeric, scaling, plan, width):
+    """
+    Fills a memory-mapped C-contiguous float32 .npy block by block.
+    """
+
+    n_numeric = len(numeric)
+    X = np.lib.format.open_memmap(path / "X.npy", mode="w+", dtype=np.float32, shape=(len(df), width))
+
+    for start in range(0, len(df), ROW_BLOCK):
+        rows = df.iloc[start:start + ROW_BLOCK]
+        X[start:start + len(rows), :n_numeric] = _numeric_block(rows, numeric, scaling)
+
+        if width > n_numeric:
+            encoded, _ = transform_encodings(plan, rows)
+            X[start:start + len(rows), n_numeric:] = encoded.toarray()
+
+    X.flush()
+    del X
+
+
+def _write_sparse(path, df, numeric, scaling, plan):
+    """
+    CSR components as separate .npy files so each can be memory-mapped.
+    """
+
+    parts = []
+
+    for start in range(0, len(df), ROW_BLOCK):
+        rows = df.iloc[start:start + ROW_BLOCK]
+        encoded, _ = transform_encodings(plan, rows)
+        dense = sparse.csr_matrix(_numeric_block(rows, numeric, scaling))
+        parts.append(sparse.hstack([dense, encoded], format="csr", dtype=np.float32))
+
+    X = sparse.vstack(parts, format="csr")
+
+    np.save(path / "X_data.npy", X.data)
+    np.save(path / "X_indices.npy", X.indices)
+    np.save(path / "X_indptr.npy", X.indptr)
+
+
+# -------------------------------------------------
+# public API
+# -------------------------------------------------
+def build_design_matrix(record, out_dir=DESIGN_DIR, dense_max_bytes=DENSE_MAX_BYTES):
+    """
+    Builds the model-ready matrix for one preprocesses_1.jsonl record.
+
+    Numeric columns pass through as float32 (standard-scaled where the
+    plan deferred scaling), deferred encodings are appended as fitted
+    in preprocess_1, the target becomes y. Written under
+    out_dir/<dataset>_<key>/ and reused when the same key exists.
+
+    Returns the manifest (dict), including its "path".
+    """
+
+    plan = PreprocessPlan.from_record(record)
+    key = _design_key(record, plan)
+
+    path = Path(out_dir) / f"{plan.dataset_name}_{key[:16]}"
+    manifest_path = path / MANIFEST_NAME
+
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    df = read_output(record["output_file_path"])
+
+    numeric = _numeric_columns(plan, df)
+    scaling = _fit_scaling(plan, df, numeric)
+    y, target_info = _target_vector(df, plan.target)
+
+    # feature layout: numeric block first, then encoded blocks
+    _, blocks = transform_encodings(plan, df.head(1))
+    features = [
+        {"column": c, "method": "scaled" if c in scaling else "numeric", "offset": j, "width": 1}
+        for j, c in enumerate(numeric)
+    ] + [
+        {**b, "offset": b["offset"] + len(numeric)} for b in blocks
+    ]
+
+    width = len(numeric) + sum(b["width"] for b in blocks)
+    layout = "dense" if len(df) * width * 4 <= dense_max_bytes else "csr"
+
+    # build next to the final directory, then rename (never half-written)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    try:
+        if layout == "dense":
+            _write_dense(tmp, df, numeric, scaling, plan, width)
+        else:
+            _write_sparse(tmp, df, numeric, scaling, plan)
+
+        if y is not None:
+            np.save(tmp / "y.npy", y)
+
+        manifest = {
+            "created_at": datetime.utcnow().isoformat(),
+            "design_key": key,
+            "source_file_path": record["output_file_path"],
+            "source_content_key": record.get("content_key"),
+            "dataset": plan.dataset_name,
+            "target": plan.target if y is not None else None,
+            "layout": layout,
+            "dtype": "float32",
+            "shape": [len(df), width],
+            "features": features,
+            "scaling": scaling,
+            "excluded": [
+                c for c in df.columns
+                if c != plan.target
+                and c not in numeric
+                and c not in {b["column"] for b in blocks}
+            ],
+            "y": target_info,
+            "path": str(path),
+        }
+
+        with open(tmp / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            # another process built the same key first
+            if not manifest_path.exists():
+                raise
+
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return manifest
+
+
+def sample_design_matrix(record, n_rows, random_state=42):
+    """
+    In-memory (X, y, target_info) for about n_rows random rows of one
+    preprocesses_1.jsonl record, laid out like build_design_matrix (X is
+    CSR). Only the sampled part of the output is read and encoded;
+    nothing is written. Scaling is fitted on the sample.
+    """
+
+    plan = PreprocessPlan.from_record(record)
+    df = sample_output(record["output_file_path"], n_rows, random_state)
+
+    numeric = _numeric_columns(plan, df)
+    scaling = _fit_scaling(plan, df, numeric)
+    y, target_info = _target_vector(df, plan.target)
+
+    encoded, _ = transform_encodings(plan, df)
+    X = sparse.hstack(
+        [sparse.csr_matrix(_numeric_block(df, numeric, scaling)), encoded],
+        format="csr", dtype=np.float32
+    )
+
+    return X, y, target_info
+
+
+def load_design_matrix(path, mmap=True):
+    """
+    Returns (X, y, manifest). With mmap the arrays are read-only views of
+    the files, so several training processes share one copy in memory.
+    """
+
+    path = Path(path)
+    mode = "r" if mmap else None
+
+    with open(path / MANIFEST_NAME, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest["layout"] == "dense":
+        X = np.load(path / "X.npy", mmap_mode=mode)
+    else:
+        X = sparse.csr_matrix(
+            (
+                np.load(path / "X_data.npy", mmap_mode=mode),
+                np.load(path / "X_indices.npy", mmap_mode=mode),
+                np.load(path / "X_indptr.npy", mmap_mode=mode),
+            ),
+            shape=tuple(manifest["shape"]),
+            copy=False,
+        )
+
+    y = np.load(path / "y.npy", mmap_mode=mode) if (path / "y.npy").exists() else None
+
+    return X, y, manifest
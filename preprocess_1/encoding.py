@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from .plan_schema import PreprocessPlan
+
+
+# above this many levels a column is hashed instead of one-hot encoded
+HASH_THRESHOLD = 256
+
+# output width of a hashed categorical column
+HASH_FEATURES = 2 ** 10
+
+# output width of a hashed text column
+TEXT_FEATURES = 2 ** 16
+
+
+# -------------------------------------------------
+# which column gets which encoding
+# -------------------------------------------------
+def encoding_actions(plan: PreprocessPlan, columns=None):
+    """
+    {column: DeferredAction} for deferred encodings.
+    A column with text_vectorization is vectorized, not one-hot encoded.
+    """
+
+    actions = {}
+
+    for d in plan.deferred:
+        if columns is not None and d.column not in columns:
+            continue
+        if d.strategy == "text_vectorization":
+            actions[d.column] = d
+        elif d.strategy == "encoding" and d.column not in actions:
+            actions[d.column] = d
+
+    return actions
+
+
+def _as_text(s):
+    """
+    Levels as strings (so vocabularies survive JSON), None for missing.
+    Whole floats print as ints: 3.0 and 3 are the same level whether or
+    not the chunk had missing values.
+    """
+
+    if pd.api.types.is_float_dtype(s):
+        v = s.dropna()
+        if (v == np.floor(v)).all() and (v.abs() < 2 ** 53).all():
+            s = s.astype("Int64")
+
+    return s.astype(str).astype(object).where(s.notna(), None)
+
+
+# -------------------------------------------------
+# fit (in memory or chunk by chunk)
+# -------------------------------------------------
+class EncodingFitter:
+    """
+    Learns vocabularies for the plan's deferred encodings.
+    Per-column memory is bounded: a column stops collecting levels once
+    it exceeds HASH_THRESHOLD and is hashed instead.
+    """
+
+    def __init__(self, plan: PreprocessPlan, hash_threshold=HASH_THRESHOLD):
+        self.plan = plan
+        self.hash_threshold = hash_threshold
+        self.actions = None
+        self.levels = {}
+
+    def update(self, df):
+
+        if self.actions is None:
+            self.actions = encoding_actions(self.plan, df.columns)
+            self.levels = {
+                c: set() for c, d in self.actions.items()
+                if d.strategy == "encoding"
+            }
+
+        for c, levels in self.levels.items():
+            if levels is None:
+                continue
+
+            levels.update(_as_text(df[c]).dropna().unique())
+
+            if len(levels) > self.hash_threshold:
+                self.levels[c] = None
+
+    def finish(self):
+        """
+        Stores the fitted encoding in each DeferredAction.params.
+        """
+
+        for c, d in (self.actions or {}).items():
+
+            if d.strategy == "text_vectorization":
+                d.params = {"method": "hashing_vectorizer", "n_features": TEXT_FEATURES}
+
+            elif self.levels[c] is None:
+                d.params = {"method": "hash", "n_features": HASH_FEATURES}
+
+            else:
+                d.params = {"method": "onehot", "categories": sorted(self.levels[c])}
+
+        return self.plan
+
+
+def fit_encodings(plan: PreprocessPlan, df):
+    fitter = EncodingFitter(plan)
+    fitter.update(df)
+    return fitter.finish()
+
+
+# -------------------------------------------------
+# transform: one CSR block per column
+# -------------------------------------------------
+def _csr_from_codes(codes, width):
+    """
+    One nonzero per row at `codes`; negative codes give an empty row.
+    """
+
+    valid = codes >= 0
+    indptr = np.concatenate([[0], np.cumsum(valid)])
+    data = np.ones(int(valid.sum()), dtype=np.float32)
+    return sparse.csr_matrix(
+        (data, codes[valid].astype(np.int32), indptr), shape=(len(codes), width)
+    )
+
+
+def _onehot(s, params):
+    categories = params["categories"]
+    codes = pd.Categorical(_as_text(s), categories=categories).codes
+    return _csr_from_codes(np.asarray(codes), len(categories))
+
+
+def _hash(s, params):
+    n = params["n_features"]
+    text = _as_text(s)
+    codes = np.full(len(text), -1, dtype=np.int64)
+
+    present = text.notna().to_numpy()
+    if present.any():
+        hashed = pd.util.hash_array(text[present].to_numpy(dtype=object))
+        codes[present] = (hashed % np.uint64(n)).astype(np.int64)
+
+    return _csr_from_codes(codes, n)
+
+
+def _hashing_vectorizer(s, params):
+    vectorizer = HashingVectorizer(
+        n_features=params["n_features"],
+        alternate_sign=False,
+        dtype=np.float32
+    )
+    return vectorizer.transform(s.fillna("").astype(str)).tocsr()
+
+
+ENCODERS = {
+    "onehot": _onehot,
+    "hash": _hash,
+    "hashing_vectorizer": _hashing_vectorizer,
+}
+
+
+def transform_encodings(plan: PreprocessPlan, df):
+    """
+    Encodes the plan's deferred columns with the fitted params.
+
+    Returns:
+        X      : scipy.sparse CSR matrix (rows of df)
+        blocks : [{"column", "method", "offset", "width"}]
+    """
+
+    mats = []
+    blocks = []
+    offset = 0
+
+    for c, d in encoding_actions(plan, df.columns).items():
+        encoder = ENCODERS.get(d.params.get("method"))
+        if encoder is None:
+            continue
+
+        m = encoder(df[c], d.params)
+
+        mats.append(m)
+        blocks.append({
+            "column": c,
+            "method": d.params["method"],
+            "offset": offset,
+            "width": m.shape[1],
+        })
+        offset += m.shape[1]
+
+    if not mats:
+        return sparse.csr_matrix((len(df), 0), dtype=np.float32), blocks
+
+    return sparse.hstack(mats, format="csr", dtype=np.float32), blocks
+
+
+def transform_encodings_chunks(plan: PreprocessPlan, chunks):
+    """
+    Streaming inference: one CSR matrix per DataFrame chunk.
+    """
+
+    for chunk in chunks:
+        yield transform_encodings(plan, chunk)[0]
@@ -1,55 +1,271 @@
 import numpy as np
 import pandas as pd
 from .plan_schema import PreprocessPlan
+from .writer import OutputWriter, csv_dtypes
+from .encoding import fit_encodings
 
 
-def _drop_columns(df, cols):
+def _present(df, cols):
+    return [c for c in cols if c in df.columns]
+
+
+def _json_value(v):
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def _json_values(series):
+    """
+    Series -> {column: python scalar}, missing statistics dropped.
+    """
+
+    return {c: _json_value(v) for c, v in series.dropna().items()}
+
+
+# -------------------------------------------------
+# statistics profiled by data_understanding
+# -------------------------------------------------
+def _known(statistics, cols, key):
+    """
+    Profiled values for cols that carry `key`; None = profiled as missing.
+    """
+
+    if not statistics:
+        return {}
+    return {
+        c: statistics[c][key]
+        for c in cols
+        if key in (statistics.get(c) or {})
+    }
+
+
+# -------------------------------------------------
+# fit: learn block parameters (one aggregation per block,
+# only over columns without profiled statistics)
+# -------------------------------------------------
+def _fit_nothing(df, cols, statistics=None):
+    return {}
+
+
+def _fit_numeric_median(df, cols, statistics=None):
+    known = _known(statistics, cols, "median")
+    rest = [c for c in cols if c not in known]
+
+    fill = _json_values(df[rest].median()) if rest else {}
+    fill.update({c: v for c, v in known.items() if v is not None})
+
+    return {"fill_values": {c: fill[c] for c in cols if c in fill}}
+
+
+def _fit_categorical_mode(df, cols, statistics=None):
+    # first row of DataFrame.mode == Series.mode().iloc[0] per column;
+    # all-missing columns come back NaN and are left untouched
+    known = _known(statistics, cols, "mode")
+    rest = [c for c in cols if c not in known]
+
+    fill = {}
+    if rest:
+        modes = df[rest].mode(dropna=True)
+        if not modes.empty:
+            fill = _json_values(modes.iloc[0])
+    fill.update({c: v for c, v in known.items() if v is not None})
+
+    return {"fill_values": {c: fill[c] for c in cols if c in fill}}
+
+
+def _fit_log_shift(df, cols, statistics=None):
+    known = _known(statistics, cols, "min")
+    rest = [c for c in cols if c not in known]
+
+    min_val = df[rest].min() if rest else pd.Series(dtype=float)
+    if known:
+        profiled = pd.Series({c: np.nan if v is None else v for c, v in known.items()}, dtype=float)
+        min_val = pd.concat([min_val, profiled])[cols]
+
+    shift = (1 - min_val).where(min_val <= 0, 0)
+    return {"shifts": {c: _json_value(v) for c, v in shift.items()}}
+
+
+# -------------------------------------------------
+# transform: apply learned parameters, O(n), no statistics
+# (return a new frame; the caller's df is never modified)
+# -------------------------------------------------
+def _drop_columns(df, cols, params):
     return df.drop(columns=cols, errors="ignore")
 
 
-def _impute_numeric_median(df, cols):
-    for c in cols:
-        if c in df.columns:
-            df[c] = df[c].fillna(df[c].median())
+def _fill_values(df, cols, params):
+    fill = {c: v for c, v in params["fill_values"].items() if c in df.columns}
+    if fill:
+        df = df.fillna(fill)
     return df
 
 
-def _impute_categorical_mode(df, cols):
-    for c in cols:
-        if c in df.columns:
-            if df[c].dropna().empty:
-                continue
-            df[c] = df[c].fillna(df[c].mode().iloc[0])
-    return df
+def _log_transform(df, cols, params):
+    shift = pd.Series(params["shifts"])
+    cols = [c for c in cols if c in shift.index]
+    if not cols:
+        return df
 
+    logged = np.log(df[cols] + shift[cols])
 
-def _log_transform(df, cols):
+    # shallow copy: whole-column assignment swaps arrays, never writes into df
+    df = df.copy(deep=False)
     for c in cols:
-        if c in df.columns:
-            min_val = df[c].min()
-            shift = 1 - min_val if min_val <= 0 else 0
-            df[c] = np.log(df[c] + shift)
+        df[c] = logged[c]
     return df
 
 
+# step_type -> (fit, transform)
 STEP_EXECUTORS = {
-    "drop_columns": _drop_columns,
-    "impute_numeric_median": _impute_numeric_median,
-    "impute_categorical_mode": _impute_categorical_mode,
-    "log_transform": _log_transform,
+    "drop_columns": (_fit_nothing, _drop_columns),
+    "impute_numeric_median": (_fit_numeric_median, _fill_values),
+    "impute_categorical_mode": (_fit_categorical_mode, _fill_values),
+    "log_transform": (_fit_log_shift, _log_transform),
 }
 
 
-def execute_plan(plan: PreprocessPlan):
-    df = pd.read_csv(plan.dataset_path)
+# -------------------------------------------------
+# plan compiler
+# -------------------------------------------------
+def compile_plan(plan: PreprocessPlan):
+    """
+    Groups consecutive steps of the same kind into one column block.
+
+    A block is closed when the next step has a different kind or touches
+    a column already in the block, so the result matches running the
+    steps one by one. Duplicate columns inside a step are applied once.
+
+    Returns:
+        [(step_type, columns, [steps]), ...]
+    """
+
+    blocks = []
 
     for step in plan.steps:
-        fn = STEP_EXECUTORS.get(step.step_type)
-        if fn is None:
-            step.status = "skipped"
+
+        cols = list(dict.fromkeys(step.columns))
+
+        if blocks and step.step_type in STEP_EXECUTORS:
+            kind, block_cols, block_steps = blocks[-1]
+            if kind == step.step_type and not set(cols) & set(block_cols):
+                block_cols.extend(cols)
+                block_steps.append(step)
+                continue
+
+        blocks.append((step.step_type, cols, [step]))
+
+    return blocks
+
+
+def _validate(plan, columns):
+    missing = plan.validate(columns)
+    if missing:
+        print(f"[PREPROCESS WARNING] {plan.dataset_name}: columns not in dataset, skipped: {missing}")
+
+
+def _split_params(params, step):
+    """
+    Keep only the entries of a block's parameters that belong to one step.
+    """
+
+    return {
+        key: {c: v for c, v in values.items() if c in step.columns}
+        for key, values in params.items()
+    }
+
+
+def _merge_params(steps):
+    merged = {}
+    for step in steps:
+        for key, values in step.params.items():
+            merged.setdefault(key, {}).update(values)
+    return merged
+
+
+# -------------------------------------------------
+# public API
+# -------------------------------------------------
+def fit_transform(plan: PreprocessPlan, df, statistics=None):
+    """
+    Learns every step's parameters (medians, modes, log shifts) on df,
+    stores them in step.params and applies them in the same pass.
+
+    statistics: {column: {"median", "mode", "min", ...}} profiled on this
+    exact file; those columns are not aggregated again.
+    """
+
+    _validate(plan, df.columns)
+
+    for step_type, cols, steps in compile_plan(plan):
+        fns = STEP_EXECUTORS.get(step_type)
+        if fns is None:
+            for step in steps:
+                step.status = "skipped"
             continue
 
-        df = fn(df, step.columns)
-        step.status = "executed"
+        fit, apply = fns
+        cols = _present(df, cols)
+
+        params = fit(df, cols, statistics) if cols else {}
+        df = apply(df, cols, params) if cols else df
+
+        for step in steps:
+            step.params.update(_split_params(params, step))
+            step.status = "executed"
+
+    return df
+
 
+def transform(plan: PreprocessPlan, df):
+    """
+    Applies a fitted plan to new data using the stored parameters only.
+    """
+
+    for step_type, cols, steps in compile_plan(plan):
+        fns = STEP_EXECUTORS.get(step_type)
+        if fns is None:
+            continue
+
+        _, apply = fns
+        cols = _present(df, cols)
+        if cols:
+            df = apply(df, cols, _merge_params(steps))
+
+    return df
+
+
+def transform_chunks(plan: PreprocessPlan, chunks):
+    """
+    Streaming inference: transform an iterator of DataFrame chunks.
+    """
+
+    for chunk in chunks:
+        yield transform(plan, chunk)
+
+
+def transform_file(plan: PreprocessPlan, input_path, output_path,
+                   chunksize=100_000, output_format="csv", on_chunk=None):
+    """
+    Applies a fitted plan to a CSV file of any size.
+    Memory stays bounded by chunksize rows.
+    on_chunk(df) is called with every transformed chunk.
+
+    Returns the output Arrow schema.
+    """
+
+    chunks = pd.read_csv(input_path, chunksize=chunksize, dtype=csv_dtypes(plan))
+
+    with OutputWriter(output_path, plan, output_format, streaming=True) as writer:
+        for chunk in transform_chunks(plan, chunks):
+            writer.write(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+
+    return writer.schema
+
+
+def execute_plan(plan: PreprocessPlan, statistics=None):
+    df = pd.read_csv(plan.dataset_path)
+    df = fit_transform(plan, df, statistics)
+    fit_encodings(plan, df)
     return df, plan
@@ -8,15 +8,21 @@ def preprocess_1_node(state: AgentState) -> Dict[str, Any]:
     """
     LangGraph node for model-independent preprocessing.
 
-    Runs preprocess_1 pipeline and updates state with results.
+    Uses the column inspection from the previous node when present;
+    otherwise falls back to the last n entries of column_inspection.jsonl.
     """
 
+    inspection = state.get("column_inspection")
+
     # how many datasets to process
     # default = 1 if not provided upstream
     last_n = state.get("preprocess_last_n", 1)
 
-    results = run_preprocess_1(last_n)
+    results = run_preprocess_1(
+        last_n,
+        inspections=[inspection] if inspection else None
+    )
 
     return {
         "preprocess_1_result": results
-    }
\ No newline at end of file
+    }
@@ -62,28 +62,49 @@
 #     with open(log_path, "a", encoding="utf-8") as f:
 #         f.write(json.dumps(record) + "\n")
 
-import json
 from pathlib import Path
 from datetime import datetime
 
+from audit_sink import append_jsonl
 
-def append_log(plan, output_csv_path: Path, log_path: Path):
 
-    record = {
+def append_record(record, log_path: Path):
+    return append_jsonl(log_path, record)
+
+
+def build_log_record(plan, output_path: Path, output_format="csv",
+                     output_schema=None, content_key=None, cache_hit=False):
+
+    return {
         "timestamp": datetime.utcnow().isoformat(),
 
+        # hash(dataset content + plan): identical runs reuse the output
+        "content_key": content_key,
+        "cache_hit": cache_hit,
+
         "dataset": plan.dataset_name,
         "dataset_path": plan.dataset_path,
+        "target": plan.target,
+
+        # profiled technical types (chunked reads and output schema)
+        "column_types": plan.column_types,
 
-        "output_file_name": output_csv_path.name,
-        "output_file_path": str(output_csv_path.resolve()),
+        "output_file_name": output_path.name,
+        "output_file_path": str(output_path.resolve()),
+
+        # readers can memory-map columnar outputs using this
+        "output_format": output_format,
+        "output_schema": output_schema,
 
         "steps": [
             {
                 "type": s.step_type,
                 "columns": s.columns,
                 "reason": s.reason,
-                "status": s.status
+                "status": s.status,
+
+                # fitted parameters (medians, modes, log shifts)
+                "params": s.params
             }
             for s in plan.steps
         ],
@@ -93,13 +114,26 @@ def append_log(plan, output_csv_path: Path, log_path: Path):
             {
                 "column": d.column,
                 "strategy": d.strategy,
-                "reason": d.reason
+                "reason": d.reason,
+
+                # fitted vocabulary / hashing width
+                "params": d.params
             }
             for d in plan.deferred
         ]
     }
 
-    log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record) + "\n")
\ No newline at end of file
+def append_log(plan, output_path: Path, log_path: Path,
+               output_format="csv", output_schema=None,
+               content_key=None, cache_hit=False):
+
+    record = build_log_record(
+        plan, output_path,
+        output_format=output_format,
+        output_schema=output_schema,
+        content_key=content_key,
+        cache_hit=cache_hit
+    )
+
+    return append_record(record, log_path)
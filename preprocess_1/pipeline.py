@@ -1,77 +1,316 @@
+import hashlib
 import json
-import uuid
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 
+from artifact_store import dataset_content_hash, put_artifact, get_artifact, tail_jsonl
+from audit_sink import flush
+
 from .planner import build_plan
 from .executor import execute_plan
-from .logger import append_log
+from .streaming import execute_plan_chunked
+from .writer import OUTPUT_FORMATS, DEFAULT_FORMAT, write_output, schema_record
+from .logger import build_log_record, append_record
 
 
 COLUMN_INSPECTION_PATH = Path("data/column_inspection.jsonl")
 OUTPUT_LOG_PATH = Path("data/preprocesses_1.jsonl")
 DATA_DIR = Path("data")
 
+OUTPUT_GLOB = "*_preprocessed_1_*"
+
+# files touched more recently may still be written (*.tmp) or not yet logged
+GC_GRACE_S = 3600
+
+
+# -------------------------------------------------
+# content addressing
+# -------------------------------------------------
+def _content_key(dataset_hash, plan, output_format, chunked):
+    """
+    Output identity = dataset content + canonical plan + output settings.
+    Streaming fits may sample medians, so they get their own key.
+    """
+
+    h = hashlib.sha256()
+    for part in (dataset_hash or plan.dataset_path, plan.signature(),
+                 output_format, "chunked" if chunked else "memory"):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _profiled_statistics(rec, dataset_hash):
+    """
+    Column statistics from the inspection record, only when the file is
+    byte-identical to the one data_understanding profiled.
+    """
+
+    if dataset_hash is None or rec.get("dataset_checksum") != dataset_hash:
+        return None
+
+    return {
+        c["column_name"]: c["statistics"]
+        for c in rec["column_profiles"]
+        if c.get("statistics")
+    }
+
+
+def _cached_record(content_key, output_path):
+    """
+    Log record of an earlier identical run whose output still exists.
+    """
+
+    if not output_path.exists():
+        return None
+    return get_artifact(content_key)
+
+
+def collect_garbage(log_path=OUTPUT_LOG_PATH, data_dir=DATA_DIR, dry_run=False,
+                    grace_s=GC_GRACE_S):
+    """
+    Delete preprocessed outputs that no preprocesses_1.jsonl record refers to.
+    Files modified in the last grace_s seconds are kept, so outputs of a
+    running pipeline are never removed; stale *.tmp files of crashed
+    runs are removed after that.
+    Returns the list of removed (or, with dry_run, removable) files.
+    """
+
+    referenced = set()
+
+    flush()
+
+    if Path(log_path).exists():
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    if rec.get("output_file_name"):
+                        referenced.add(rec["output_file_name"])
+
+    removed = []
+    cutoff = time.time() - grace_s
+
+    for p in Path(data_dir).glob(OUTPUT_GLOB):
+        if p.name in referenced:
+            continue
+
+        try:
+            if p.stat().st_mtime > cutoff:
+                continue
+            if not dry_run:
+                p.unlink()
+        except FileNotFoundError:
+            # renamed or removed by a running pipeline meanwhile
+            continue
+
+        removed.append(p)
+
+    return removed
+
+
+# -------------------------------------------------
+# one dataset (runs in a worker process when workers > 1)
+# -------------------------------------------------
+def _process_record(rec, drop_leakage, chunksize, output_format):
+    """
+    Plans, executes and writes one dataset. Nothing is appended to the
+    log here: the log record is returned and the parent process writes it.
+
+    Returns (result, log_record, artifact) where artifact is
+    (dataset_path, dataset_hash, content_key), or None on a cache hit.
+    """
+
+    dataset_path = rec["dataset_file_path"]
+    column_profiles = rec["column_profiles"]
+
+    # -----------------------------
+    # PLAN
+    # -----------------------------
+    plan = build_plan(dataset_path, column_profiles, drop_leakage=drop_leakage)
+
+    dataset_name = Path(dataset_path).stem
+    dataset_hash = dataset_content_hash(dataset_path)
+    content_key = _content_key(dataset_hash, plan, output_format, bool(chunksize))
+
+    suffix = OUTPUT_FORMATS[output_format]
+    output_path = DATA_DIR / f"{dataset_name}_preprocessed_1_{content_key[:16]}{suffix}"
+
+    result = {
+        "dataset": dataset_name,
+        "output_path": str(output_path),
+        # pre-Parquet name of output_path, kept for existing callers
+        "output_csv": str(output_path),
+        "output_format": output_format,
+    }
+
+    # -----------------------------
+    # REUSE (same data + same plan)
+    # -----------------------------
+    cached = _cached_record(content_key, output_path)
+
+    if cached is not None:
+        record = {**cached, "timestamp": datetime.utcnow().isoformat(), "cache_hit": True}
+        return {**result, "cache_hit": True}, record, None
+
+    # -----------------------------
+    # EXECUTE + SAVE (write then rename, never half-written)
+    # -----------------------------
+    # pid in the temp name: the same dataset may be listed twice in a batch
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+
+    statistics = _profiled_statistics(rec, dataset_hash)
+
+    try:
+        if chunksize:
+            # streaming fit pass (skipped when fully profiled), then chunks appended
+            plan, schema = execute_plan_chunked(
+                plan, tmp_path,
+                chunksize=chunksize, output_format=output_format,
+                statistics=statistics
+            )
+        else:
+            df, plan = execute_plan(plan, statistics)
+            schema = write_output(df, tmp_path, plan, output_format)
+
+        os.replace(tmp_path, output_path)
+
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    record = build_log_record(
+        plan, output_path,
+        output_format=output_format,
+        output_schema=schema_record(schema),
+        content_key=content_key
+    )
+
+    return {**result, "cache_hit": False}, record, (dataset_path, dataset_hash, content_key)
 
-def _unique_suffix():
-    """Short unique id for file versioning"""
-    return uuid.uuid4().hex[:8]
+
+def _dataset_size(rec):
+    try:
+        return os.path.getsize(rec["dataset_file_path"])
+    except OSError:
+        return 0
+
+
+def _failed(rec, exc):
+    """
+    Result of a dataset whose worker raised; the batch goes on.
+    """
+
+    dataset = Path(rec["dataset_file_path"]).stem
+    error = f"{type(exc).__name__}: {exc}"
+
+    print(f"[PREPROCESS WARNING] {dataset}: {error}")
+
+    return {
+        "dataset": dataset,
+        "output_path": None,
+        "output_csv": None,
+        "error": error,
+        # includes the worker-side traceback (chained by concurrent.futures)
+        "traceback": "".join(traceback.format_exception(exc)),
+    }
+
+
+def _commit(record, artifact):
+    """
+    Parent-side bookkeeping: the only place the log and store are written.
+    """
+
+    append_record(record, OUTPUT_LOG_PATH)
+
+    if artifact is not None:
+        dataset_path, dataset_hash, content_key = artifact
+        put_artifact(
+            "preprocess", record,
+            dataset_path=dataset_path, dataset_hash=dataset_hash, run_id=content_key
+        )
 
 
 # -------------------------------------------------
 # main exposed function
 # -------------------------------------------------
-def run_preprocess_1(last_n: int):
+def run_preprocess_1(
+    last_n: int,
+    drop_leakage: bool = True,
+    chunksize: int | None = None,
+    output_format: str = DEFAULT_FORMAT,
+    workers: int = 1,
+    inspections: list | None = None
+):
     """
     Runs model-independent preprocessing for last n inspection entries.
 
     All outputs stored ONLY in data/
-    Each output gets unique suffix to prevent overwrite.
-    Output file path stored in preprocesses_1.jsonl
+    Output names are content addressed (dataset content + plan), so an
+    unchanged dataset and plan reuse the existing output instead of
+    executing again. Output file path stored in preprocesses_1.jsonl
+
+    drop_leakage : drop columns flagged as target leakage by data_understanding
+    chunksize    : rows per chunk for out-of-core execution (None = in memory)
+    output_format: parquet (zstd, default) | feather | csv
+    workers      : datasets processed in parallel (process pool, largest first)
+    inspections  : column inspection records passed in memory (graph run);
+                   last_n and column_inspection.jsonl are then not used
+
+    Serially (workers=1) a failing dataset raises, as before. With a pool
+    it does not stop the batch: a warning is printed and its result
+    carries "error" and "traceback".
+    Successful results carry the log "record" for the next stage.
     """
 
-    if not COLUMN_INSPECTION_PATH.exists():
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    if inspections is None and not COLUMN_INSPECTION_PATH.exists():
         raise FileNotFoundError("data/column_inspection.jsonl not found")
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(COLUMN_INSPECTION_PATH, "r", encoding="utf-8") as f:
-        records = [json.loads(line) for line in f]
+    records = inspections if inspections is not None else tail_jsonl(COLUMN_INSPECTION_PATH, last_n)
 
-    records = records[-last_n:]
+    results = [None] * len(records)
 
-    results = []
+    if workers <= 1:
+        for i in range(len(records)):
+            result, record, artifact = _process_record(
+                records[i], drop_leakage, chunksize, output_format
+            )
 
-    for rec in records:
-        dataset_path = rec["dataset_file_path"]
-        column_profiles = rec["column_profiles"]
+            _commit(record, artifact)
+            results[i] = {**result, "record": record}
 
-        # -----------------------------
-        # PLAN
-        # -----------------------------
-        plan = build_plan(dataset_path, column_profiles)
+        return results
 
-        # -----------------------------
-        # EXECUTE
-        # -----------------------------
-        df, plan = execute_plan(plan)
+    # workers look up the artifact index: land queued writes first
+    flush()
 
-        dataset_name = Path(dataset_path).stem
-        uid = _unique_suffix()
+    # largest first: long jobs start early, short ones fill the gaps
+    order = sorted(range(len(records)), key=lambda i: _dataset_size(records[i]), reverse=True)
 
-        # -----------------------------
-        # SAVE (unique version)
-        # -----------------------------
-        output_csv = DATA_DIR / f"{dataset_name}_preprocessed_1_{uid}.csv"
-        df.to_csv(output_csv, index=False)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_process_record, records[i], drop_leakage, chunksize, output_format): i
+            for i in order
+        }
 
-        # -----------------------------
-        # LOG (includes output file info)
-        # -----------------------------
-        append_log(plan, output_csv, OUTPUT_LOG_PATH)
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result, record, artifact = future.result()
+            except Exception as e:
+                results[i] = _failed(records[i], e)
+                continue
 
-        results.append({
-            "dataset": dataset_name,
-            "output_csv": str(output_csv)
-        })
+            _commit(record, artifact)
+            results[i] = {**result, "record": record}
 
-    return results
\ No newline at end of file
+    return results
@@ -21,6 +21,7 @@
 #     def add_step(self, step: Step):
 #         self.steps.append(step)
 
+import json
 from dataclasses import dataclass, field
 from typing import List, Dict, Any
 
@@ -40,6 +41,9 @@ class DeferredAction:
     strategy: str
     reason: str
 
+    # fitted encoding (vocabulary / hashing width), see encoding.py
+    params: Dict[str, Any] = field(default_factory=dict)
+
 
 @dataclass
 class PreprocessPlan:
@@ -47,13 +51,82 @@ class PreprocessPlan:
     dataset_name: str
     steps: List[Step] = field(default_factory=list)
 
+    # target column from the inspection profiles (None if unknown)
+    target: str | None = None
+
+    # {column: technical_type} from the inspection profiles (whole file)
+    column_types: Dict[str, str] = field(default_factory=dict)
+
     # column-level deferred operations
     deferred: List[DeferredAction] = field(default_factory=list)
 
     def add_step(self, step: Step):
         self.steps.append(step)
 
-    def add_deferred(self, column: str, strategy: str, reason: str):
+    def add_deferred(self, column: str, strategy: str, reason: str,
+                     params: Dict[str, Any] | None = None):
         self.deferred.append(
-            DeferredAction(column, strategy, reason)
-        )
\ No newline at end of file
+            DeferredAction(column, strategy, reason, params or {})
+        )
+
+    def validate(self, columns) -> List[str]:
+        """
+        Prune step columns that are not in the dataset schema and drop
+        steps left without columns. Returns the missing column names.
+        """
+
+        present = set(columns)
+        missing = []
+
+        for step in self.steps:
+            missing.extend(c for c in step.columns if c not in present)
+            step.columns = [c for c in step.columns if c in present]
+
+        self.steps = [s for s in self.steps if s.columns]
+
+        return list(dict.fromkeys(missing))
+
+    def signature(self) -> str:
+        """
+        Canonical JSON of what the plan does to the data (step kinds and
+        columns, target, deferred actions; before fitting). Used for
+        content-addressed outputs.
+        """
+
+        return json.dumps(
+            {
+                "steps": [{"type": s.step_type, "columns": s.columns} for s in self.steps],
+                "target": self.target,
+                "deferred": sorted([d.column, d.strategy] for d in self.deferred),
+            },
+            sort_keys=True,
+            separators=(",", ":")
+        )
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "PreprocessPlan":
+        """
+        Rebuild a fitted plan from a preprocesses_1.jsonl record
+        (for applying the same preprocessing to new data).
+        """
+
+        plan = cls(
+            dataset_path=record["dataset_path"],
+            dataset_name=record["dataset"],
+            target=record.get("target"),
+            column_types=record.get("column_types") or {}
+        )
+
+        for s in record.get("steps", []):
+            plan.add_step(Step(
+                step_type=s["type"],
+                columns=s.get("columns", []),
+                params=s.get("params", {}),
+                reason=s.get("reason", ""),
+                status=s.get("status", "planned")
+            ))
+
+        for d in record.get("deferred", []):
+            plan.add_deferred(d["column"], d["strategy"], d["reason"], d.get("params"))
+
+        return plan
\ No newline at end of file
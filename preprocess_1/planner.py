@@ -1,21 +1,50 @@
-import pandas as pd
 from pathlib import Path
 from .plan_schema import PreprocessPlan, Step
 
 
-def _safe_colnames(df, names):
-    return [c for c in names if c in df.columns]
+# features explaining less than this share of target entropy
+LOW_RELEVANCE_MI = 0.001
 
 
-def build_plan(dataset_path: str, column_profiles: list) -> PreprocessPlan:
+def _safe_colnames(columns, names):
+    return [c for c in names if c in columns]
+
+
+def build_plan(
+    dataset_path: str,
+    column_profiles: list,
+    drop_leakage: bool = True,
+    columns: list | None = None
+) -> PreprocessPlan:
+    """
+    Builds the plan from the inspection profiles only; the dataset is
+    not read. columns defaults to the profiled column names. Columns
+    missing from the actual file are pruned once, at execution time
+    (PreprocessPlan.validate).
+    """
+
     dataset_path = str(Path(dataset_path))
     dataset_name = Path(dataset_path).stem
 
-    df = pd.read_csv(dataset_path)
+    if columns is None:
+        columns = [c["column_name"] for c in column_profiles]
+
+    columns = set(columns)
+
+    target = next(
+        (c["column_name"] for c in column_profiles if c.get("role") == "target"),
+        None
+    )
 
     plan = PreprocessPlan(
         dataset_path=dataset_path,
-        dataset_name=dataset_name
+        dataset_name=dataset_name,
+        target=target,
+        column_types={
+            c["column_name"]: c["technical_type"]
+            for c in column_profiles
+            if c.get("technical_type")
+        }
     )
 
     # ---------------------------------
@@ -27,7 +56,7 @@ def build_plan(dataset_path: str, column_profiles: list) -> PreprocessPlan:
         if c.get("semantic_type") == "identifier"
     ]
 
-    identifier_cols = _safe_colnames(df, identifier_cols)
+    identifier_cols = _safe_colnames(columns, identifier_cols)
 
     if identifier_cols:
         plan.add_step(Step(
@@ -36,6 +65,27 @@ def build_plan(dataset_path: str, column_profiles: list) -> PreprocessPlan:
             reason="identifier columns"
         ))
 
+    # ---------------------------------
+    # 1b. drop suspected target leakage
+    # ---------------------------------
+    leakage_cols = [
+        c["column_name"]
+        for c in column_profiles
+        if any(
+            f.get("rule") == "target_leakage"
+            for f in (c.get("data_quality_flags") or [])
+        )
+    ]
+
+    leakage_cols = _safe_colnames(columns, leakage_cols)
+
+    if drop_leakage and leakage_cols:
+        plan.add_step(Step(
+            step_type="drop_columns",
+            columns=leakage_cols,
+            reason="suspected target leakage"
+        ))
+
     # ---------------------------------
     # 2. missing value handling
     # ---------------------------------
@@ -49,8 +99,8 @@ def build_plan(dataset_path: str, column_profiles: list) -> PreprocessPlan:
             else:
                 categorical_missing.append(c["column_name"])
 
-    numeric_missing = _safe_colnames(df, numeric_missing)
-    categorical_missing = _safe_colnames(df, categorical_missing)
+    numeric_missing = _safe_colnames(columns, numeric_missing)
+    categorical_missing = _safe_colnames(columns, categorical_missing)
 
     if numeric_missing:
         plan.add_step(Step(
@@ -75,7 +125,7 @@ def build_plan(dataset_path: str, column_profiles: list) -> PreprocessPlan:
         if c.get("transform_hint") == "log_candidate"
     ]
 
-    log_candidates = _safe_colnames(df, log_candidates)
+    log_candidates = _safe_colnames(columns, log_candidates)
 
     if log_candidates:
         plan.add_step(Step(
@@ -134,4 +184,13 @@ def build_plan(dataset_path: str, column_profiles: list) -> PreprocessPlan:
                 reason="highly_correlated"
             )
 
+        # uninformative about the target (model dependent decision)
+        relevance = c.get("target_relevance")
+        if relevance and relevance["normalized_mi"] < LOW_RELEVANCE_MI:
+            plan.add_deferred(
+                column=col,
+                strategy="feature_selection",
+                reason="low_target_relevance"
+            )
+
     return plan
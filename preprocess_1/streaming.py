@@ -0,0 +1,265 @@
+import numpy as np
+import pandas as pd
+
+from .plan_schema import PreprocessPlan
+from .executor import (
+    STEP_EXECUTORS,
+    compile_plan,
+    transform_file,
+    _split_params,
+    _json_value,
+    _validate,
+)
+from .encoding import EncodingFitter
+from .writer import csv_dtypes
+
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# values kept per column for the median; exact below this many rows
+RESERVOIR_SIZE = 1_000_000
+
+# float64 bytes shared by all median reservoirs of one fit
+RESERVOIR_BUDGET_BYTES = 64 * 2 ** 20
+
+
+# -------------------------------------------------
+# streaming column statistics
+# -------------------------------------------------
+class ColumnSketch:
+    """
+    One-pass statistics for a single column.
+        min    : exact
+        mode   : exact (value counts, bounded by cardinality)
+        median : exact up to reservoir_size values, reservoir sample beyond
+    """
+
+    def __init__(self, need_median, need_mode, need_min, reservoir_size, rng):
+        self.need_median = need_median
+        self.need_mode = need_mode
+        self.need_min = need_min
+
+        self.min = np.nan
+        self.counts = None
+        self.seen = 0
+        self.reservoir = np.empty(reservoir_size if need_median else 0)
+        self.rng = rng
+
+    def update(self, s):
+
+        if self.need_min:
+            m = s.min()
+            if not pd.isna(m) and (pd.isna(self.min) or m < self.min):
+                self.min = m
+
+        if self.need_mode:
+            vc = s.value_counts(dropna=True)
+            self.counts = vc if self.counts is None else self.counts.add(vc, fill_value=0)
+
+        if self.need_median:
+            self._sample(pd.to_numeric(s, errors="coerce").dropna().to_numpy(dtype=np.float64))
+
+    def _sample(self, values):
+        cap = len(self.reservoir)
+        m = len(values)
+
+        # fill the free slots first
+        free = max(0, min(cap - self.seen, m))
+        self.reservoir[self.seen:self.seen + free] = values[:free]
+
+        # then Algorithm R, vectorised over the rest of the chunk
+        rest = values[free:]
+        if len(rest):
+            positions = self.seen + free + np.arange(len(rest))
+            slots = (self.rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+            keep = slots < cap
+            self.reservoir[slots[keep]] = rest[keep]
+
+        self.seen += m
+
+    def median(self):
+        n = min(self.seen, len(self.reservoir))
+        return float(np.median(self.reservoir[:n])) if n else np.nan
+
+    def mode(self):
+        if self.counts is None or self.counts.empty:
+            return np.nan
+
+        # same tie-break as Series.mode(): smallest of the most frequent
+        top = self.counts[self.counts == self.counts.max()].index
+        try:
+            return top.sort_values()[0]
+        except TypeError:
+            return top[0]
+
+
+# -------------------------------------------------
+# streaming fit
+# -------------------------------------------------
+def _columns_needing(plan, header, statistics=None):
+    """
+    Walk the compiled plan against the header to see which statistics
+    each still-present column needs (profiled statistics excluded).
+    """
+
+    present = list(header)
+    needs = {}
+
+    for step_type, cols, _ in compile_plan(plan):
+        cols = [c for c in cols if c in present]
+
+        if step_type == "drop_columns":
+            present = [c for c in present if c not in cols]
+        elif step_type == "impute_numeric_median":
+            for c in cols:
+                needs.setdefault(c, set()).add("median")
+        elif step_type == "impute_categorical_mode":
+            for c in cols:
+                needs.setdefault(c, set()).add("mode")
+        elif step_type == "log_transform":
+            for c in cols:
+                needs.setdefault(c, set()).add("min")
+
+    statistics = statistics or {}
+
+    for c in list(needs):
+        needs[c] = {n for n in needs[c] if n not in (statistics.get(c) or {})}
+        if not needs[c]:
+            del needs[c]
+
+    return needs
+
+
+def _stat(statistics, sketches, c, key):
+    """
+    Profiled value when available, streamed sketch otherwise (NaN = missing).
+    """
+
+    profiled = (statistics or {}).get(c) or {}
+    if key in profiled:
+        v = profiled[key]
+        return np.nan if v is None else v
+
+    sketch = sketches[c]
+    if key == "median":
+        return sketch.median()
+    if key == "mode":
+        return sketch.mode()
+    return sketch.min
+
+
+def _reservoir_size(n_median_cols, chunksize):
+    """
+    Per-column reservoir: the memory budget split over the median
+    columns, never below one chunk (already held in memory) and never
+    above RESERVOIR_SIZE.
+    """
+
+    share = RESERVOIR_BUDGET_BYTES // (8 * max(1, n_median_cols))
+    return int(min(RESERVOIR_SIZE, max(chunksize, share)))
+
+
+def fit_streaming(plan: PreprocessPlan, chunksize=DEFAULT_CHUNKSIZE,
+                  reservoir_size=None, random_state=42, statistics=None):
+    """
+    Fits plan parameters in one streaming pass over the CSV.
+    reservoir_size: values kept per median column (None = from
+    RESERVOIR_BUDGET_BYTES and chunksize).
+
+    Statistics are taken on the raw columns: median / mode imputation
+    never moves a column's minimum, so log shifts match an in-memory fit.
+    Columns with profiled statistics are not read; when all are
+    profiled the pass is skipped entirely.
+    """
+
+    header = pd.read_csv(plan.dataset_path, nrows=0).columns
+    _validate(plan, header)
+
+    needs = _columns_needing(plan, header, statistics)
+
+    if reservoir_size is None:
+        reservoir_size = _reservoir_size(
+            sum("median" in n for n in needs.values()), chunksize
+        )
+
+    rng = np.random.default_rng(random_state)
+    sketches = {
+        c: ColumnSketch("median" in n, "mode" in n, "min" in n, reservoir_size, rng)
+        for c, n in needs.items()
+    }
+
+    if sketches:
+        reader = pd.read_csv(
+            plan.dataset_path, usecols=list(sketches), chunksize=chunksize,
+            dtype=csv_dtypes(plan, sketches)
+        )
+        for chunk in reader:
+            for c, sketch in sketches.items():
+                sketch.update(chunk[c])
+
+    present = list(header)
+
+    for step_type, cols, steps in compile_plan(plan):
+
+        if step_type not in STEP_EXECUTORS:
+            for step in steps:
+                step.status = "skipped"
+            continue
+
+        cols = [c for c in cols if c in present]
+        params = {}
+
+        if step_type == "drop_columns":
+            present = [c for c in present if c not in cols]
+
+        elif step_type == "impute_numeric_median":
+            medians = {c: _stat(statistics, sketches, c, "median") for c in cols}
+            params = {"fill_values": {c: v for c, v in medians.items() if not pd.isna(v)}}
+
+        elif step_type == "impute_categorical_mode":
+            modes = {c: _stat(statistics, sketches, c, "mode") for c in cols}
+            params = {"fill_values": {
+                c: _json_value(v) for c, v in modes.items() if not pd.isna(v)
+            }}
+
+        elif step_type == "log_transform":
+            mins = {c: _stat(statistics, sketches, c, "min") for c in cols}
+            params = {"shifts": {
+                c: _json_value(1 - m if m <= 0 else 0)
+                for c, m in mins.items()
+            }}
+
+        for step in steps:
+            step.params.update(_split_params(params, step))
+            step.status = "executed"
+
+    return plan
+
+
+# -------------------------------------------------
+# chunked execution
+# -------------------------------------------------
+def execute_plan_chunked(plan: PreprocessPlan, output_path,
+                         chunksize=DEFAULT_CHUNKSIZE, output_format="csv",
+                         statistics=None, reservoir_size=None):
+    """
+    Out-of-core execution: streaming fit, then transform chunk by chunk
+    and append to output_path. Encoding vocabularies are learned from the
+    transformed chunks. Peak memory is bounded by chunksize and the
+    median reservoirs (see fit_streaming).
+
+    Returns (plan, output Arrow schema).
+    """
+
+    fit_streaming(plan, chunksize=chunksize, statistics=statistics,
+                  reservoir_size=reservoir_size)
+
+    encodings = EncodingFitter(plan)
+    schema = transform_file(
+        plan, plan.dataset_path, output_path,
+        chunksize=chunksize, output_format=output_format,
+        on_chunk=encodings.update
+    )
+    encodings.finish()
+
+    return plan, schema
@@ -0,0 +1,269 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .plan_schema import PreprocessPlan
+
+
+OUTPUT_FORMATS = {
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "csv": ".csv",
+}
+
+DEFAULT_FORMAT = "parquet"
+DEFAULT_COMPRESSION = "zstd"
+
+# parquet row groups / feather record batches; a row sample reads at most
+# SAMPLE_GROUPS of them, whatever the file size
+ROW_GROUP_ROWS = 16_384
+SAMPLE_GROUPS = 8
+
+# bytes per block when counting csv lines
+LINE_COUNT_BLOCK = 1 << 20
+
+# steps whose output columns are always float64
+FLOAT_STEPS = {"impute_numeric_median", "log_transform"}
+
+# profiled technical types written as text
+STRING_TYPES = {"object", "str", "string", "category"}
+
+
+# -------------------------------------------------
+# schema from the plan
+# -------------------------------------------------
+def _profiled_type(technical_type):
+    """
+    Arrow type for a column profiled over the whole file, None when the
+    profile does not pin it down (datetimes, unknown).
+    """
+
+    t = technical_type.lower()
+
+    if t.startswith(("int", "uint", "float")):
+        # NaN can appear in any chunk once imputation is planned
+        return pa.float64()
+    if t.startswith("bool"):
+        return pa.bool_()
+    if t in STRING_TYPES:
+        return pa.string()
+    return None
+
+
+def output_schema(plan: PreprocessPlan, df, streaming=False):
+    """
+    Arrow schema for the preprocessed output.
+
+    Imputed / log-transformed numeric columns are float64 by construction.
+    In streaming mode the type of each column comes from the inspection
+    profiles (plan.column_types, whole-file types), so a column that is
+    all-missing or integer-only in the first chunk does not fix a type
+    later chunks cannot be cast to. Other columns keep the type inferred
+    from df (first chunk when streaming; integers widened to float64).
+    """
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+
+    float_cols = {
+        c for s in plan.steps if s.step_type in FLOAT_STEPS for c in s.columns
+    }
+
+    for i, field in enumerate(schema):
+        profiled = (
+            _profiled_type(plan.column_types[field.name])
+            if streaming and field.name in plan.column_types else None
+        )
+
+        if profiled is not None:
+            schema = schema.set(i, pa.field(field.name, profiled))
+        elif pa.types.is_integer(field.type) and (streaming or field.name in float_cols):
+            schema = schema.set(i, pa.field(field.name, pa.float64()))
+        elif pa.types.is_null(field.type):
+            # all-missing in the first chunk: keep it nullable text
+            schema = schema.set(i, pa.field(field.name, pa.string()))
+
+    return schema
+
+
+def csv_dtypes(plan: PreprocessPlan, columns=None):
+    """
+    read_csv dtypes for chunked reads: text columns stay text even in a
+    chunk whose values all look numeric (as in the whole-file read).
+    """
+
+    return {
+        c: str for c, t in plan.column_types.items()
+        if t.lower() in STRING_TYPES and (columns is None or c in columns)
+    }
+
+
+def schema_record(schema):
+    return {field.name: str(field.type) for field in schema}
+
+
+# -------------------------------------------------
+# writer (whole frame or chunk by chunk)
+# -------------------------------------------------
+class OutputWriter:
+    """
+    Writes DataFrames to parquet (zstd), feather (Arrow IPC, zstd) or csv.
+    write() can be called once per chunk (pass streaming=True); call
+    close() at the end.
+    """
+
+    def __init__(self, path, plan: PreprocessPlan, output_format=DEFAULT_FORMAT,
+                 compression=DEFAULT_COMPRESSION, streaming=False):
+
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self.path = path
+        self.plan = plan
+        self.output_format = output_format
+        self.compression = compression
+        self.streaming = streaming
+        self.schema = None
+        self._writer = None
+        self._rows = 0
+
+    def write(self, df):
+
+        if self.schema is None:
+            self.schema = output_schema(self.plan, df, self.streaming)
+
+        if self.output_format == "csv":
+            df.to_csv(self.path, mode="a" if self._rows else "w",
+                      header=not self._rows, index=False)
+
+        else:
+            table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+
+            if self._writer is None:
+                self._writer = self._open()
+
+            if self.output_format == "parquet":
+                self._writer.write_table(table, row_group_size=ROW_GROUP_ROWS)
+            else:
+                self._writer.write_table(table, max_chunksize=ROW_GROUP_ROWS)
+
+        self._rows += len(df)
+
+    def _open(self):
+
+        if self.output_format == "parquet":
+            return pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_file(str(self.path), self.schema, options=options)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_output(df, path, plan: PreprocessPlan, output_format=DEFAULT_FORMAT):
+    with OutputWriter(path, plan, output_format) as writer:
+        writer.write(df)
+    return writer.schema
+
+
+# -------------------------------------------------
+# reader (memory-mapped for columnar formats)
+# -------------------------------------------------
+def read_output(path, columns=None):
+    path = str(path)
+
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+    if path.endswith(".feather"):
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas()
+
+    return pd.read_csv(path, usecols=columns)
+
+
+# -------------------------------------------------
+# row sample (bounded read, for cheap probes)
+# -------------------------------------------------
+def _pick_groups(n_groups, size_of, n_rows, rng):
+    """
+    Random row groups: SAMPLE_GROUPS of them (spread over the file), more
+    only while they hold fewer than n_rows rows. size_of(i) is only
+    called for picked groups.
+    """
+
+    picked = []
+    rows = 0
+
+    for i in rng.permutation(n_groups):
+        picked.append(int(i))
+        rows += size_of(int(i))
+        if len(picked) >= SAMPLE_GROUPS and rows >= n_rows:
+            break
+
+    return sorted(picked)
+
+
+def _count_lines(path):
+    lines = 0
+    with open(path, "rb") as f:
+        while block := f.read(LINE_COUNT_BLOCK):
+            lines += block.count(b"\n")
+    return lines
+
+
+def sample_output(path, n_rows, random_state=42):
+    """
+    About n_rows random rows of a preprocessed output.
+
+    Columnar outputs read at most SAMPLE_GROUPS random row groups /
+    record batches. Csv outputs are scanned once for the line count and
+    only the sampled lines are parsed.
+    """
+
+    path = str(path)
+    rng = np.random.default_rng(random_state)
+
+    if path.endswith(".parquet"):
+        f = pq.ParquetFile(path, memory_map=True)
+        picked = _pick_groups(
+            f.num_row_groups, lambda i: f.metadata.row_group(i).num_rows, n_rows, rng
+        )
+        df = f.read_row_groups(picked).to_pandas()
+
+    elif path.endswith(".feather"):
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            batches = {}
+
+            def size_of(i):
+                batches[i] = reader.get_batch(i)
+                return batches[i].num_rows
+
+            picked = _pick_groups(reader.num_record_batches, size_of, n_rows, rng)
+            df = pa.Table.from_batches([batches[i] for i in picked], schema=reader.schema).to_pandas()
+
+    else:
+        total = max(0, _count_lines(path) - 1)
+        if total > n_rows:
+            keep = set((rng.choice(total, size=n_rows, replace=False) + 1).tolist())
+            df = pd.read_csv(path, skiprows=lambda i: i > 0 and i not in keep)
+        else:
+            df = pd.read_csv(path)
+
+    if len(df) > n_rows:
+        df = df.sample(n=n_rows, random_state=random_state).sort_index()
+
+    return df.reset_index(drop=True)
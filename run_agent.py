@@ -1,6 +1,7 @@
 from langgraph.graph import StateGraph, END
 
 from agent_state import AgentState
+from audit_sink import flush
 from schema_engine.langgraph_node import schema_inference_node
 from data_understanding.langgraph_node import data_understanding_node
 from preprocess_1.langgraph_node import preprocess_1_node
@@ -61,5 +62,8 @@ if __name__ == "__main__":
     print("\n=== FINAL STATE ===\n")
     print(result)
 
+    # logs are written in the background; read them back only once written
+    flush()
+
     print("\n=== LAST CLASSIFICATION ===\n")
     print_last_n_role_constants("data/data_classification.jsonl", n=1)
\ No newline at end of file
@@ -1,7 +1,9 @@
 from pathlib import Path
-import json
 from datetime import datetime
 
+from artifact_store import put_artifact
+from audit_sink import append_jsonl
+
 
 def export_schema_result(
     dataset_path,
@@ -12,6 +14,9 @@ def export_schema_result(
 
     Output location:
         project_root/data/data_classification.jsonl
+        project_root/data/artifacts.sqlite (indexed, kind="schema")
+
+    Returns the artifact run id.
     """
 
     dataset_path = Path(dataset_path).resolve()
@@ -46,10 +51,14 @@ def export_schema_result(
     }
 
     # ------------------------------
-    # append JSONL
+    # append JSONL (audit sink, asynchronous)
+    # ------------------------------
+    append_jsonl(jsonl_path, record, ensure_ascii=False)
+
+    # ------------------------------
+    # indexed store (latest lookup)
     # ------------------------------
-    with open(jsonl_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return put_artifact("schema", record, dataset_path=dataset_path)
 
 
 def export_user_inputs(
@@ -90,9 +99,7 @@ def export_user_inputs(
         "target_columns": list(target_column),
     }
 
-    # ---------------- append JSONL ----------------
-    with output_file.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(record, separators=(",", ":")))
-        f.write("\n")
+    # ---------------- append JSONL (audit sink) ----------------
+    append_jsonl(output_file, record, separators=(",", ":"))
 
     print(f"User input appended → {output_file}")
\ No newline at end of file
@@ -100,6 +100,7 @@ def run_schema_inference(
         }
 
     final_output = {
+        "dataset_file_path": str(Path(data_path).resolve()),
         "n_rows": len(df),
         "n_columns": len(df.columns),
         "target": target_column,
@@ -109,7 +110,7 @@ def run_schema_inference(
     # ----------------------------
     # EXPORT (APPEND MODE)
     # ----------------------------
-    export_schema_result(data_path, final_output)
+    final_output["run_id"] = export_schema_result(data_path, final_output)
 
     export_user_inputs(data_path, categorical_columns, target_column)
 
@@ -0,0 +1,123 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_understanding.column_profiler import column_statistics
+from preprocess_1.executor import execute_plan, transform
+from preprocess_1.plan_schema import PreprocessPlan, Step
+
+# python -m tests.test_preprocess_1_executor
+# execute_plan (fused blocks, fit/transform) must stay bit-for-bit equal
+# to the original per-column step loop.
+
+
+# --------------------------------------------------
+# the original executor, one column at a time
+# --------------------------------------------------
+def _reference_execute(plan):
+    df = pd.read_csv(plan.dataset_path)
+
+    for step in plan.steps:
+        for c in step.columns:
+            if c not in df.columns:
+                continue
+
+            if step.step_type == "drop_columns":
+                df = df.drop(columns=[c])
+
+            elif step.step_type == "impute_numeric_median":
+                df[c] = df[c].fillna(df[c].median())
+
+            elif step.step_type == "impute_categorical_mode":
+                if df[c].dropna().empty:
+                    continue
+                df[c] = df[c].fillna(df[c].mode().iloc[0])
+
+            elif step.step_type == "log_transform":
+                min_val = df[c].min()
+                shift = 1 - min_val if min_val <= 0 else 0
+                df[c] = np.log(df[c] + shift)
+
+    return df
+
+
+def _frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame({
+        "income": rng.lognormal(10, 1, n),
+        "balance": rng.normal(0, 100, n),
+        "calls": rng.integers(0, 20, n).astype(float),
+        "score": rng.normal(50, 10, n),
+        "city": rng.choice(["a", "b", "c"], n),
+        "plan": rng.choice(["basic", "pro"], n),
+        "notes": np.nan,
+        "empty_num": np.nan,
+        "row_id": np.arange(n),
+        "target": rng.integers(0, 2, n),
+    })
+
+    for c, share in [("income", 0.1), ("balance", 0.2), ("calls", 0.05),
+                     ("score", 0.3), ("city", 0.15), ("plan", 0.1)]:
+        df.loc[rng.random(n) < share, c] = np.nan
+
+    df["notes"] = df["notes"].astype(object)
+
+    return df
+
+
+def _plan(path):
+    plan = PreprocessPlan(dataset_path=str(path), dataset_name="equivalence", target="target")
+
+    # two steps of the same kind are fused into one block
+    plan.add_step(Step("drop_columns", ["row_id"]))
+    plan.add_step(Step("impute_numeric_median", ["income", "balance"]))
+    plan.add_step(Step("impute_numeric_median", ["calls", "score", "empty_num"]))
+    plan.add_step(Step("impute_categorical_mode", ["city", "plan", "notes"]))
+    plan.add_step(Step("log_transform", ["income", "balance", "calls"]))
+
+    return plan
+
+
+def test_execute_plan_matches_reference():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "equivalence.csv"
+        _frame().to_csv(path, index=False)
+
+        expected = _reference_execute(_plan(path))
+
+        raw = pd.read_csv(path)
+
+        for statistics in (None, column_statistics(raw)):
+            df, plan = execute_plan(_plan(path), statistics)
+
+            pd.testing.assert_frame_equal(df, expected, check_exact=True)
+            assert all(s.status == "executed" for s in plan.steps)
+
+
+def test_transform_leaves_input_untouched():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "equivalence.csv"
+        _frame().to_csv(path, index=False)
+
+        _, plan = execute_plan(_plan(path))
+
+        # without the drop step nothing copies the frame before the fills
+        plan.steps = [s for s in plan.steps if s.step_type != "drop_columns"]
+
+        new = _frame(seed=1)
+        before = new.copy()
+
+        transform(plan, new)
+
+        pd.testing.assert_frame_equal(new, before, check_exact=True)
+
+
+if __name__ == "__main__":
+    test_execute_plan_matches_reference()
+    test_transform_leaves_input_untouched()
+    print("TEST COMPLETED!")